@@ -1,22 +1,41 @@
+import time
+# Start of module import, for the import time and time-to-ready reported by /readyz
+IMPORT_STARTED_AT = time.time()
+
 from fastapi import FastAPI, HTTPException, Request
 from fastapi.middleware.cors import CORSMiddleware
-from fastapi.responses import JSONResponse, HTMLResponse, Response
+from fastapi.responses import JSONResponse, HTMLResponse, Response, StreamingResponse, PlainTextResponse
 from fastapi.staticfiles import StaticFiles
-import requests
-from bs4 import BeautifulSoup
+from pydantic import BaseModel, Field
 import re
-from typing import List, Dict
+import asyncio
+from typing import List, Dict, Optional
+from urllib.parse import urljoin, quote, quote_plus
 import json
+import hashlib
+import zlib
+from email.utils import formatdate
+import unicodedata
+import math
+import sqlite3
+import queue
+import statistics
 import random
-import time
 import logging
-from selenium import webdriver
-from selenium.webdriver.chrome.service import Service
-from selenium.webdriver.chrome.options import Options
-from selenium.webdriver.common.by import By
-from selenium.webdriver.support.ui import WebDriverWait
-from selenium.webdriver.support import expected_conditions as EC
-from selenium.common.exceptions import TimeoutException
+import os
+import sys
+import importlib
+import importlib.util
+import threading
+import uuid
+import contextvars
+import functools
+import multiprocessing
+import multiprocessing.util
+from collections import deque, OrderedDict, Counter
+from contextlib import contextmanager, asynccontextmanager
+from concurrent.futures import ThreadPoolExecutor, ProcessPoolExecutor
+from concurrent.futures.process import BrokenProcessPool
 
 # Set up logging with more detailed format
 logging.basicConfig(
@@ -25,7 +44,435 @@ logging.basicConfig(
 )
 logger = logging.getLogger(__name__)
 
-app = FastAPI()
+# Selenium, requests and bs4 are imported on first use (or by the background
+# warm-up) so the module itself loads fast on a cold start
+lazy_import_seconds = {}
+
+def lazy_import(name: str):
+    loaded = name in sys.modules
+    start = time.perf_counter()
+    module = importlib.import_module(name)
+    if not loaded:
+        lazy_import_seconds[name] = time.perf_counter() - start
+        logger.info(f"Imported {name} in {lazy_import_seconds[name]:.2f}s")
+    return module
+
+# Browser pool settings
+DRIVER_POOL_SIZE = int(os.environ.get("DRIVER_POOL_SIZE", "3"))
+DRIVER_POOL_PREWARM = int(os.environ.get("DRIVER_POOL_PREWARM", str(DRIVER_POOL_SIZE)))
+DRIVER_MAX_USES = int(os.environ.get("DRIVER_MAX_USES", "50"))
+DRIVER_CHECKOUT_TIMEOUT = float(os.environ.get("DRIVER_CHECKOUT_TIMEOUT", "30"))
+
+# Driver watchdog: every DRIVER_WATCHDOG_INTERVAL seconds (0 disables) drivers over
+# DRIVER_MAX_RSS_MB (whole process tree) or DRIVER_MAX_AGE are recycled once idle,
+# sessions over DRIVER_KILL_RSS_MB or checked out longer than DRIVER_MAX_SESSION_SECONDS
+# are killed, and orphaned Chrome processes older than DRIVER_ORPHAN_GRACE are reaped
+DRIVER_WATCHDOG_INTERVAL = float(os.environ.get("DRIVER_WATCHDOG_INTERVAL", "30"))
+DRIVER_MAX_RSS_MB = float(os.environ.get("DRIVER_MAX_RSS_MB", "1024"))
+DRIVER_KILL_RSS_MB = float(os.environ.get("DRIVER_KILL_RSS_MB", "2048"))
+DRIVER_MAX_AGE = float(os.environ.get("DRIVER_MAX_AGE", "1800"))
+DRIVER_MAX_SESSION_SECONDS = float(os.environ.get("DRIVER_MAX_SESSION_SECONDS", "120"))
+DRIVER_ORPHAN_GRACE = float(os.environ.get("DRIVER_ORPHAN_GRACE", "60"))
+# Every Chrome this server launches carries this tag in its environment (worker
+# processes inherit it), so only our own orphans are ever reaped
+CHROME_OWNER_ENV = "PRICE_SCRAPER_CHROME_OWNER"
+CHROME_OWNER = os.environ.setdefault(CHROME_OWNER_ENV, uuid.uuid4().hex)
+
+# Blocking scrapers run on this many threads, off the event loop
+SCRAPE_WORKERS = int(os.environ.get("SCRAPE_WORKERS", str(DRIVER_POOL_SIZE * 2)))
+
+# "thread" scrapes inside the API process; "process" hands each platform job to a
+# pool of worker processes, each with its own Chrome drivers
+SCRAPE_BACKEND = os.environ.get("SCRAPE_BACKEND", "thread").lower()
+SCRAPE_PROCESSES_PER_CORE = float(os.environ.get("SCRAPE_PROCESSES_PER_CORE", "1"))
+SCRAPE_PROCESSES = int(os.environ.get(
+    "SCRAPE_PROCESSES", str(max(1, int((os.cpu_count() or 1) * SCRAPE_PROCESSES_PER_CORE)))
+))
+# Drivers kept by each worker process (it runs one job at a time)
+SCRAPE_PROCESS_DRIVERS = int(os.environ.get("SCRAPE_PROCESS_DRIVERS", "1"))
+SCRAPE_JOB_TIMEOUT = float(os.environ.get("SCRAPE_JOB_TIMEOUT", "45"))
+# Extra attempts when a worker dies mid-job; a timed-out job is not retried, since its
+# worker is still busy with it and a retry would only queue behind it
+SCRAPE_JOB_RETRIES = int(os.environ.get("SCRAPE_JOB_RETRIES", "1"))
+
+# "auto" tries a plain HTTP fetch first and falls back to Selenium,
+# "http" and "selenium" use only that tier
+FETCH_MODE = os.environ.get("FETCH_MODE", "auto").lower()
+HTTP_TIMEOUT = float(os.environ.get("HTTP_TIMEOUT", "8"))
+
+USER_AGENT = 'Mozilla/5.0 (Windows NT 10.0; Win64; x64) AppleWebKit/537.36 (KHTML, like Gecko) Chrome/120.0.0.0 Safari/537.36'
+
+# psutil lets the driver watchdog see Chrome's process tree; without it the watchdog is off
+try:
+    import psutil
+except ImportError:
+    psutil = None
+
+# Brotli compresses JSON better than gzip and is used when the client accepts it
+try:
+    import brotli
+except ImportError:
+    brotli = None
+
+# lxml is much faster than the stdlib parser but optional (checked without importing it)
+HTML_PARSER = "lxml" if importlib.util.find_spec("lxml") is not None else "html.parser"
+
+# Search pages and fallback selectors, in the order they are tried
+PLATFORMS = {
+    "Amazon": {
+        "search_url": "https://www.amazon.in/s?k={query}",
+        "query_space": "+",
+        "product": '[data-component-type="s-search-result"]',
+        "price": ['span.a-price-whole', 'span.a-offscreen', 'span.a-price'],
+        "link": ['a.a-link-normal.s-no-outline', 'a.a-link-normal.s-underline-text', 'a.a-link-normal'],
+        "title": ['h2 a span', 'h2 span', 'span.a-text-normal'],
+        "mrp": ['span.a-price.a-text-price span.a-offscreen', 'span.a-text-price'],
+        "sponsored": ['.puis-sponsored-label-text', 'span.s-sponsored-label-text', '.s-label-popover-default'],
+        "catch_all": ['span.a-price', 'a.a-link-normal'],
+        # Shown instead of result cards when a search matches nothing
+        "no_results": '.s-no-results-filler, [data-component-type="s-no-results"]',
+        "deadline": 15,
+        "blocked_urls": ['*amazon-adsystem.com*', '*fls-eu.amazon.*', '*unagi.amazon.*'],
+        # Product image hosts, blocked only with BLOCK_IMAGES
+        "image_urls": [],
+    },
+    "Flipkart": {
+        "search_url": "https://www.flipkart.com/search?q={query}",
+        "query_space": "%20",
+        "product": 'div._1AtVbE, div._4rR01T, div.tUxRFH, div._2kHMtA',
+        "price": ['div._30jeq3', 'div._1_WHN1', 'div._16Jk6d'],
+        "link": ['a._1fQZEK', 'a._2UzuFa', 'a.s1Q9rs'],
+        "title": ['div._4rR01T', 'a.s1Q9rs', 'a.IRpwTa'],
+        "mrp": ['div._3I9_wc', 'div._27UcVY'],
+        "sponsored": ['div._2tfzpE', 'div._4ddWXP span.f8qK5m'],
+        "catch_all": [],
+        "no_results": 'img[src*="error-no-search-results"]',
+        "deadline": 10,
+        "blocked_urls": [],
+        "image_urls": ['*rukminim*.flixcart.com*'],
+    },
+    "Meesho": {
+        "search_url": "https://www.meesho.com/search?q={query}",
+        "query_space": "%20",
+        "product": 'div.ProductList__GridCol, div.sc-dkzDqf, div.ProductCard__BaseCard',
+        "price": ['div.ProductCard__Price', 'div.sc-dkzDqf', 'div.ProductCard__PriceText'],
+        "link": ['a.ProductCard__Link', 'a.sc-dkzDqf', 'a.ProductCard__BaseCard'],
+        "title": ['p.ProductCard__ProductTitle', 'p[class*="ProductTitle"]', 'p'],
+        "mrp": ['p.ProductCard__MRP', 'span[class*="StrikeThrough"]'],
+        "sponsored": ['span.ProductCard__AdTag', 'span[class*="AdTag"]'],
+        "catch_all": ['p'],
+        "no_results": 'div[class*="NoResult"], div[class*="EmptyState"]',
+        "deadline": 10,
+        "blocked_urls": [],
+        "image_urls": ['*images.meesho.com*'],
+    },
+}
+
+# SEARCH_URL_<PLATFORM> points a platform at another host, e.g. the benchmark fixture server
+for platform, config in PLATFORMS.items():
+    config["search_url"] = os.environ.get(f"SEARCH_URL_{platform.upper()}", config["search_url"])
+
+def platform_env(name: str, platform: str, default: str) -> str:
+    """Read NAME_<PLATFORM>, falling back to NAME and then the default."""
+    return os.environ.get(f"{name}_{platform.upper()}", os.environ.get(name, default))
+
+# Result cache settings; CACHE_STALE_TTL is how long past expiry an entry may
+# still be served while it is refreshed in the background (0 disables that)
+CACHE_ENABLED = os.environ.get("CACHE_ENABLED", "1") == "1"
+CACHE_MAX_SIZE = int(os.environ.get("CACHE_MAX_SIZE", "1000"))
+CACHE_TTLS = {platform: float(platform_env("CACHE_TTL", platform, "300")) for platform in PLATFORMS}
+CACHE_NEGATIVE_TTL = float(os.environ.get("CACHE_NEGATIVE_TTL", "30"))
+CACHE_STALE_TTL = float(os.environ.get("CACHE_STALE_TTL", "600"))
+
+# Price history: every observation is written to this SQLite file ("" disables it).
+# A stored observation younger than HISTORY_MAX_AGE answers /compare without scraping.
+HISTORY_DB_PATH = os.environ.get("HISTORY_DB_PATH", "price_history.db")
+HISTORY_MAX_AGE = float(os.environ.get("HISTORY_MAX_AGE", "300"))
+HISTORY_BATCH_SIZE = int(os.environ.get("HISTORY_BATCH_SIZE", "200"))
+HISTORY_FLUSH_INTERVAL = float(os.environ.get("HISTORY_FLUSH_INTERVAL", "1.0"))
+
+# Selector hit rates and latencies are kept here across restarts ("" keeps them in memory only)
+SELECTOR_STATS_PATH = os.environ.get("SELECTOR_STATS_PATH", "selector_stats.json")
+SELECTOR_STATS_SAVE_INTERVAL = float(os.environ.get("SELECTOR_STATS_SAVE_INTERVAL", "60"))
+# Weight of the newest lookup in a selector's running hit rate
+SELECTOR_SCORE_DECAY = float(os.environ.get("SELECTOR_SCORE_DECAY", "0.1"))
+
+# Background refresh of watched and popular queries. Each platform gets its own
+# refresh budget, and entries are refreshed a little before their cache TTL runs out.
+SCHEDULER_ENABLED = os.environ.get("SCHEDULER_ENABLED", "1") == "1"
+SCHEDULER_TICK = float(os.environ.get("SCHEDULER_TICK", "5"))
+WATCH_REFRESH_INTERVALS = {
+    platform: float(platform_env("WATCH_REFRESH_INTERVAL", platform, str(CACHE_TTLS[platform] * 0.8)))
+    for platform in PLATFORMS
+}
+WATCH_JITTER = float(os.environ.get("WATCH_JITTER", "0.2"))
+REFRESH_BUDGETS = {
+    platform: float(platform_env("REFRESH_BUDGET", platform, "6"))
+    for platform in PLATFORMS
+}
+WATCHLIST_MAX_SIZE = int(os.environ.get("WATCHLIST_MAX_SIZE", "200"))
+POPULAR_TRACK_COUNT = int(os.environ.get("POPULAR_TRACK_COUNT", "20"))
+POPULAR_MIN_REQUESTS = int(os.environ.get("POPULAR_MIN_REQUESTS", "3"))
+POPULAR_DECAY_INTERVAL = float(os.environ.get("POPULAR_DECAY_INTERVAL", "3600"))
+
+# Admission control: at most ADMISSION_MAX_ACTIVE scrapes run at once (one per
+# scrape thread or process by default, so nothing piles up unseen in the executor), up to
+# ADMISSION_QUEUE_SIZE more wait at most ADMISSION_MAX_WAIT seconds, the rest are
+# turned away with 503 + Retry-After (or served their last known result)
+ADMISSION_MAX_ACTIVE = int(os.environ.get(
+    "ADMISSION_MAX_ACTIVE", str(SCRAPE_PROCESSES if SCRAPE_BACKEND == "process" else SCRAPE_WORKERS)
+))
+ADMISSION_QUEUE_SIZE = int(os.environ.get("ADMISSION_QUEUE_SIZE", "32"))
+ADMISSION_MAX_WAIT = float(os.environ.get("ADMISSION_MAX_WAIT", "10"))
+ADMISSION_SERVE_STALE = os.environ.get("ADMISSION_SERVE_STALE", "1") == "1"
+ADMISSION_STALE_MAX_AGE = float(os.environ.get("ADMISSION_STALE_MAX_AGE", "86400"))
+# Let streaming requests start scraping without waiting in the queue
+ADMISSION_STREAM_BYPASS = os.environ.get("ADMISSION_STREAM_BYPASS", "0") == "1"
+
+# Batch compare: most queries per request, and scrapes a batch runs at once. The
+# default leaves half the scrape slots to interactive /compare requests.
+BATCH_MAX_QUERIES = int(os.environ.get("BATCH_MAX_QUERIES", "500"))
+BATCH_CONCURRENCY = int(os.environ.get("BATCH_CONCURRENCY", str(max(1, ADMISSION_MAX_ACTIVE // 2))))
+
+# Overall time a browser scrape may spend loading the page and waiting for results
+# to render, per platform
+SCRAPE_DEADLINES = {
+    platform: float(platform_env("SCRAPE_DEADLINE", platform, str(config["deadline"])))
+    for platform, config in PLATFORMS.items()
+}
+SCRAPE_POLL_INTERVAL = float(os.environ.get("SCRAPE_POLL_INTERVAL", "0.25"))
+# A page that has finished loading and still shows no product card after this many
+# seconds (or shows the platform's no-results marker) is taken as having no results
+SCRAPE_SETTLE_SECONDS = float(os.environ.get("SCRAPE_SETTLE_SECONDS", "2"))
+
+# Adaptive deadlines: once enough successful scrapes are seen, a platform waits
+# FACTOR x the chosen latency percentile, between MIN and its SCRAPE_DEADLINE
+ADAPTIVE_DEADLINES = os.environ.get("ADAPTIVE_DEADLINES", "1") == "1"
+ADAPTIVE_DEADLINE_PERCENTILE = float(os.environ.get("ADAPTIVE_DEADLINE_PERCENTILE", "95"))
+ADAPTIVE_DEADLINE_FACTOR = float(os.environ.get("ADAPTIVE_DEADLINE_FACTOR", "1.5"))
+ADAPTIVE_DEADLINE_MIN = float(os.environ.get("ADAPTIVE_DEADLINE_MIN", "2"))
+ADAPTIVE_MIN_SAMPLES = int(os.environ.get("ADAPTIVE_MIN_SAMPLES", "20"))
+
+# Circuit breaker per platform: opens when at least BREAKER_FAILURE_RATE of the last
+# BREAKER_WINDOW seconds of scrapes timed out or failed, then probes after BREAKER_COOLDOWN
+BREAKER_WINDOW = float(os.environ.get("BREAKER_WINDOW", "120"))
+BREAKER_MIN_REQUESTS = int(os.environ.get("BREAKER_MIN_REQUESTS", "5"))
+BREAKER_FAILURE_RATE = float(os.environ.get("BREAKER_FAILURE_RATE", "0.5"))
+BREAKER_COOLDOWN = float(os.environ.get("BREAKER_COOLDOWN", "30"))
+
+# Listings read per search page; the best match among them is returned
+DEFAULT_TOP_N = int(os.environ.get("DEFAULT_TOP_N", "5"))
+MAX_TOP_N = int(os.environ.get("MAX_TOP_N", "20"))
+# Listings priced below this fraction of the median match are treated as accessories
+ACCESSORY_PRICE_RATIO = float(os.environ.get("ACCESSORY_PRICE_RATIO", "0.4"))
+
+# Lean browser profile: don't wait for subresources and skip downloads we never read.
+# "eager" returns once the DOM is parsed, "none" as soon as navigation starts.
+PAGE_LOAD_STRATEGY = os.environ.get("PAGE_LOAD_STRATEGY", "eager")
+BLOCK_IMAGES = os.environ.get("BLOCK_IMAGES", "1") == "1"
+# Added to the blocked URLs (with each platform's "image_urls") only when BLOCK_IMAGES is on
+BLOCKED_IMAGE_URLS = ['*.png', '*.jpg', '*.jpeg', '*.gif', '*.webp', '*.avif', '*.svg', '*.ico']
+DEFAULT_BLOCKED_URLS = [
+    # Fonts and media
+    '*.woff', '*.woff2', '*.ttf', '*.otf', '*.mp4', '*.webm', '*.m3u8', '*.mp3',
+    # Ads and analytics
+    '*google-analytics.com*', '*googletagmanager.com*', '*doubleclick.net*',
+    '*googlesyndication.com*', '*facebook.net*', '*connect.facebook.com*',
+    '*hotjar.com*', '*clarity.ms*', '*branch.io*', '*criteo.*',
+]
+
+def parse_url_list(value: str) -> List[str]:
+    return [pattern.strip() for pattern in value.split(",") if pattern.strip()]
+
+# BLOCKED_URLS replaces the shared list and BLOCKED_URLS_<PLATFORM> the platform list;
+# an empty value turns that part off. Image patterns follow BLOCK_IMAGES alone.
+BLOCKED_URLS = {}
+for platform, config in PLATFORMS.items():
+    shared = os.environ.get("BLOCKED_URLS")
+    own = os.environ.get(f"BLOCKED_URLS_{platform.upper()}")
+    BLOCKED_URLS[platform] = (
+        (DEFAULT_BLOCKED_URLS if shared is None else parse_url_list(shared))
+        + (config["blocked_urls"] if own is None else parse_url_list(own))
+        + (BLOCKED_IMAGE_URLS + config["image_urls"] if BLOCK_IMAGES else [])
+    )
+
+# Text responses of at least this many bytes (and all streams) are gzip/brotli compressed; 0 disables
+COMPRESS_MIN_SIZE = int(os.environ.get("COMPRESS_MIN_SIZE", "1024"))
+COMPRESS_LEVEL = int(os.environ.get("COMPRESS_LEVEL", "6"))
+COMPRESS_MEDIA_TYPES = ("application/json", "application/x-ndjson", "text/")
+
+# Add a Server-Timing breakdown to every response, not only when ?timing=1 is passed
+TIMING_HEADERS = os.environ.get("TIMING_HEADERS", "0") == "1"
+
+HISTOGRAM_BUCKETS = (0.05, 0.1, 0.25, 0.5, 1, 2.5, 5, 10, 20, 30, 60)
+
+class Metrics:
+    """Minimal Prometheus-style counters, gauges and histograms."""
+
+    def __init__(self):
+        self._lock = threading.Lock()
+        self._help = {}
+        self._counters = {}
+        self._gauges = {}
+        self._histograms = {}
+
+    def describe(self, name: str, kind: str, help_text: str):
+        self._help[name] = (kind, help_text)
+
+    @staticmethod
+    def _key(name: str, labels: Optional[Dict]):
+        return name, tuple(sorted((labels or {}).items()))
+
+    def inc(self, name: str, labels: Dict = None, value: float = 1):
+        key = self._key(name, labels)
+        with self._lock:
+            self._counters[key] = self._counters.get(key, 0) + value
+
+    def set_gauge(self, name: str, value: float, labels: Dict = None):
+        with self._lock:
+            self._gauges[self._key(name, labels)] = value
+
+    def observe(self, name: str, value: float, labels: Dict = None):
+        key = self._key(name, labels)
+        with self._lock:
+            histogram = self._histograms.get(key)
+            if histogram is None:
+                histogram = self._histograms[key] = {"buckets": [0] * len(HISTOGRAM_BUCKETS), "sum": 0.0, "count": 0}
+            for i, bound in enumerate(HISTOGRAM_BUCKETS):
+                if value <= bound:
+                    histogram["buckets"][i] += 1
+            histogram["sum"] += value
+            histogram["count"] += 1
+
+    def take(self):
+        """Return and reset counters and histograms, to ship them to another process."""
+        with self._lock:
+            counters, self._counters = self._counters, {}
+            histograms, self._histograms = self._histograms, {}
+        return counters, histograms
+
+    def merge(self, counters: Dict, histograms: Dict):
+        with self._lock:
+            for key, value in counters.items():
+                self._counters[key] = self._counters.get(key, 0) + value
+            for key, other in histograms.items():
+                histogram = self._histograms.get(key)
+                if histogram is None:
+                    histogram = self._histograms[key] = {"buckets": [0] * len(HISTOGRAM_BUCKETS), "sum": 0.0, "count": 0}
+                histogram["buckets"] = [a + b for a, b in zip(histogram["buckets"], other["buckets"])]
+                histogram["sum"] += other["sum"]
+                histogram["count"] += other["count"]
+
+    @staticmethod
+    def _labels(labels, extra=()) -> str:
+        pairs = list(labels) + list(extra)
+        if not pairs:
+            return ""
+        return "{" + ",".join(f'{name}="{value}"' for name, value in pairs) + "}"
+
+    def render(self) -> str:
+        lines = []
+        with self._lock:
+            by_name = {}
+            for (name, labels), value in sorted(self._counters.items()):
+                by_name.setdefault(name, []).append(f"{name}{self._labels(labels)} {value}")
+            for (name, labels), value in sorted(self._gauges.items()):
+                by_name.setdefault(name, []).append(f"{name}{self._labels(labels)} {value}")
+            for (name, labels), histogram in sorted(self._histograms.items()):
+                samples = by_name.setdefault(name, [])
+                for bound, count in zip(HISTOGRAM_BUCKETS, histogram["buckets"]):
+                    samples.append(f"{name}_bucket{self._labels(labels, [('le', bound)])} {count}")
+                samples.append(f"{name}_bucket{self._labels(labels, [('le', '+Inf')])} {histogram['count']}")
+                samples.append(f"{name}_sum{self._labels(labels)} {histogram['sum']}")
+                samples.append(f"{name}_count{self._labels(labels)} {histogram['count']}")
+        for name in sorted(by_name):
+            if name in self._help:
+                kind, help_text = self._help[name]
+                lines.append(f"# HELP {name} {help_text}")
+                lines.append(f"# TYPE {name} {kind}")
+            lines.extend(by_name[name])
+        return "\n".join(lines) + "\n"
+
+metrics = Metrics()
+metrics.describe("http_requests_total", "counter", "HTTP requests by route and status")
+metrics.describe("http_request_duration_seconds", "histogram", "HTTP request latency by route")
+metrics.describe("scrape_stage_seconds", "histogram", "Time spent in each scrape stage")
+metrics.describe("scrape_results_total", "counter", "Platform scrape outcomes (ok, empty, timeout, error, degraded)")
+metrics.describe("http_fallbacks_total", "counter", "HTTP fetches that fell back to Selenium")
+metrics.describe("driver_start_seconds", "histogram", "Time to launch and configure a Chrome driver")
+metrics.describe("driver_pool_drivers", "gauge", "Pooled Chrome drivers by state")
+metrics.describe("result_cache_entries", "gauge", "Entries in the result cache")
+metrics.describe("result_cache_lookups_total", "counter", "Result cache lookups by result")
+metrics.describe("singleflight_coalesced_total", "counter", "Requests that joined an identical in-flight scrape")
+metrics.describe("circuit_breaker_state", "gauge", "Circuit breaker state per platform")
+metrics.describe("admission_active", "gauge", "Scrapes currently admitted")
+metrics.describe("admission_queue_depth", "gauge", "Scrapes waiting for admission")
+metrics.describe("admission_wait_seconds", "histogram", "Time scrapes spent queued for admission")
+metrics.describe("admission_rejections_total", "counter", "Scrapes turned away by admission control")
+metrics.describe("scrape_worker_processes", "gauge", "Scrape worker processes (process backend)")
+metrics.describe("scrape_worker_restarts_total", "counter", "Times the scrape worker pool was restarted after a worker died")
+metrics.describe("scrape_job_failures_total", "counter", "Scrape jobs that timed out or lost their worker")
+metrics.describe("chrome_sessions", "gauge", "Live chromedriver sessions, worker processes included")
+metrics.describe("chrome_processes", "gauge", "Chrome and chromedriver processes under this server")
+metrics.describe("chrome_memory_bytes", "gauge", "Resident memory of those processes")
+metrics.describe("driver_recycled_total", "counter", "Drivers the watchdog recycled, by reason")
+metrics.describe("driver_processes_killed_total", "counter", "Chrome processes killed, by reason")
+metrics.describe("app_import_seconds", "gauge", "Time taken to import the application module")
+metrics.describe("app_time_to_ready_seconds", "gauge", "Time from module import to the first ready state")
+metrics.describe("app_startup_stage_seconds", "gauge", "Time taken by each startup stage")
+metrics.describe("app_lazy_import_seconds", "gauge", "Time taken by each lazily imported module")
+metrics.describe("app_ready", "gauge", "1 once startup finished and warm scrape capacity exists")
+metrics.describe("scrape_deadline_seconds", "gauge", "Current adaptive wait deadline per platform")
+
+# Per-request list of (platform, stage, seconds), set by the timing middleware
+request_timings = contextvars.ContextVar("request_timings", default=None)
+
+@contextmanager
+def timed(platform: str, stage: str):
+    start = time.perf_counter()
+    try:
+        yield
+    finally:
+        elapsed = time.perf_counter() - start
+        metrics.observe("scrape_stage_seconds", elapsed, {"platform": platform, "stage": stage})
+        timings = request_timings.get()
+        if timings is not None:
+            timings.append((platform, stage, elapsed))
+
+# Startup and shutdown run as named stages from the lifespan hook; each component
+# registers its stage next to its own code
+startup_stages = []
+shutdown_stages = []
+startup_stage_seconds = {}
+
+def startup_stage(name: str):
+    def register(fn):
+        startup_stages.append((name, fn))
+        return fn
+    return register
+
+def shutdown_stage(fn):
+    shutdown_stages.append(fn)
+    return fn
+
+@asynccontextmanager
+async def lifespan(app):
+    for name, stage in startup_stages:
+        start = time.perf_counter()
+        await stage()
+        startup_stage_seconds[name] = time.perf_counter() - start
+    readiness.mark_started()
+    logger.info(f"Startup stages done in {sum(startup_stage_seconds.values()):.2f}s: "
+                + ", ".join(f"{name} {seconds:.2f}s" for name, seconds in startup_stage_seconds.items()))
+    yield
+    # Stop things in the reverse order they were started
+    for stage in reversed(shutdown_stages):
+        try:
+            await stage()
+        except Exception as e:
+            logger.error(f"Error during shutdown in {stage.__name__}: {str(e)}")
+
+app = FastAPI(lifespan=lifespan)
 
 # Add CORS middleware
 app.add_middleware(
@@ -36,6 +483,24 @@ app.add_middleware(
     allow_headers=["*"],
 )
 
+@app.middleware("http")
+async def record_timings(request: Request, call_next):
+    timings = []
+    request_timings.set(timings)
+    start = time.perf_counter()
+    response = await call_next(request)
+    elapsed = time.perf_counter() - start
+
+    route = request.scope.get("route")
+    path = route.path if route is not None else "unmatched"
+    metrics.inc("http_requests_total", {"path": path, "status": response.status_code})
+    metrics.observe("http_request_duration_seconds", elapsed, {"path": path})
+    if TIMING_HEADERS or request.query_params.get("timing") == "1":
+        spans = [f"{platform.lower()}-{stage};dur={seconds * 1000:.1f}" for platform, stage, seconds in timings]
+        spans.append(f"total;dur={elapsed * 1000:.1f}")
+        response.headers["Server-Timing"] = ", ".join(spans)
+    return response
+
 @app.middleware("http")
 async def log_requests(request: Request, call_next):
     logger.info(f"Incoming request: {request.method} {request.url}")
@@ -50,6 +515,68 @@ async def log_requests(request: Request, call_next):
             content={"detail": f"Internal server error: {str(e)}"}
         )
 
+def pick_encoding(accept_encoding: str) -> Optional[str]:
+    accepted = {
+        part.split(";")[0].strip() for part in accept_encoding.lower().split(",")
+        if not part.strip().endswith("q=0")
+    }
+    if brotli is not None and "br" in accepted:
+        return "br"
+    if "gzip" in accepted:
+        return "gzip"
+    return None
+
+class StreamCompressor:
+    """Compresses a response chunk by chunk, flushing each so streams stay live."""
+
+    def __init__(self, encoding: str):
+        self.encoding = encoding
+        if encoding == "br":
+            self._brotli = brotli.Compressor(quality=min(COMPRESS_LEVEL, 11))
+        else:
+            self._zlib = zlib.compressobj(COMPRESS_LEVEL, zlib.DEFLATED, 31)
+
+    def compress(self, chunk: bytes) -> bytes:
+        if self.encoding == "br":
+            return self._brotli.process(chunk) + self._brotli.flush()
+        return self._zlib.compress(chunk) + self._zlib.flush(zlib.Z_SYNC_FLUSH)
+
+    def finish(self) -> bytes:
+        if self.encoding == "br":
+            return self._brotli.finish()
+        return self._zlib.flush()
+
+@app.middleware("http")
+async def compress_responses(request: Request, call_next):
+    response = await call_next(request)
+    encoding = pick_encoding(request.headers.get("accept-encoding", ""))
+    content_type = response.headers.get("content-type", "")
+    if (
+        COMPRESS_MIN_SIZE <= 0 or encoding is None or response.status_code in (204, 304)
+        or "content-encoding" in response.headers or not content_type.startswith(COMPRESS_MEDIA_TYPES)
+    ):
+        return response
+    length = response.headers.get("content-length")
+    if length is not None and int(length) < COMPRESS_MIN_SIZE:
+        return response
+
+    compressor = StreamCompressor(encoding)
+    body_iterator = response.body_iterator
+
+    async def compressed():
+        async for chunk in body_iterator:
+            if isinstance(chunk, str):
+                chunk = chunk.encode("utf-8")
+            data = compressor.compress(chunk)
+            if data:
+                yield data
+        yield compressor.finish()
+
+    headers = {name: value for name, value in response.headers.items() if name != "content-length"}
+    headers["content-encoding"] = encoding
+    headers["vary"] = "Accept-Encoding"
+    return StreamingResponse(compressed(), status_code=response.status_code, headers=headers)
+
 @app.get("/")
 async def root():
     return HTMLResponse("""
@@ -93,6 +620,29 @@ async def root():
         </div>
 
         <script>
+            const STATUS_MESSAGES = {
+                error: 'Could not check this platform',
+                parse_error: 'Could not read the results page',
+                timeout: 'Timed out, please try again',
+                busy: 'Busy, please try again shortly',
+                degraded: 'Temporarily unavailable',
+            };
+
+            function renderCard(item) {
+                return `
+                    <div class="result-card bg-white rounded-lg shadow-md p-6">
+                        <h2 class="text-xl font-semibold mb-4 text-gray-800">${item.platform}</h2>
+                        <p class="text-2xl font-bold text-blue-600 mb-4">₹${item.price.toLocaleString()}</p>
+                        ${item.link ? `
+                            <a href="${item.link}" target="_blank" 
+                               class="block text-center px-4 py-2 bg-green-500 text-white rounded-lg hover:bg-green-600 transition-colors">
+                                View Product
+                            </a>
+                        ` : `<p class="text-red-500 text-center">${STATUS_MESSAGES[item.status] || 'Product not found'}</p>`}
+                    </div>
+                `;
+            }
+
             async function searchProduct() {
                 const productInput = document.getElementById('productInput');
                 const loading = document.getElementById('loading');
@@ -107,21 +657,28 @@ async def root():
                 results.innerHTML = '';
 
                 try {
-                    const response = await fetch(`/compare/${encodeURIComponent(productInput.value)}`);
-                    const data = await response.json();
-                    
-                    results.innerHTML = data.map(item => `
-                        <div class="result-card bg-white rounded-lg shadow-md p-6">
-                            <h2 class="text-xl font-semibold mb-4 text-gray-800">${item.platform}</h2>
-                            <p class="text-2xl font-bold text-blue-600 mb-4">₹${item.price.toLocaleString()}</p>
-                            ${item.link ? `
-                                <a href="${item.link}" target="_blank" 
-                                   class="block text-center px-4 py-2 bg-green-500 text-white rounded-lg hover:bg-green-600 transition-colors">
-                                    View Product
-                                </a>
-                            ` : '<p class="text-red-500 text-center">Product not found</p>'}
-                        </div>
-                    `).join('');
+                    // Results arrive as one JSON object per line, fastest platform first
+                    const response = await fetch(`/compare/${encodeURIComponent(productInput.value)}/stream`);
+                    if (!response.ok) {
+                        throw new Error(`Request failed with status ${response.status}`);
+                    }
+                    const reader = response.body.getReader();
+                    const decoder = new TextDecoder();
+                    let buffer = '';
+
+                    while (true) {
+                        const { value, done } = await reader.read();
+                        if (done) break;
+                        buffer += decoder.decode(value, { stream: true });
+                        const lines = buffer.split('\\n');
+                        buffer = lines.pop();
+                        lines.filter(line => line.trim()).forEach(line => {
+                            results.insertAdjacentHTML('beforeend', renderCard(JSON.parse(line)));
+                        });
+                    }
+                    if (buffer.trim()) {
+                        results.insertAdjacentHTML('beforeend', renderCard(JSON.parse(buffer)));
+                    }
                 } catch (error) {
                     results.innerHTML = `
                         <div class="col-span-3 text-center text-red-500">
@@ -146,17 +703,18 @@ async def root():
 
 def clean_price(price_str: str) -> float:
     try:
-        # Extract numbers from price string
-        numbers = re.findall(r'\d+', price_str)
-        if numbers:
-            return float(''.join(numbers))
+        # Take the first number, ignoring thousands separators ("₹1,299.00" -> 1299.0)
+        match = re.search(r'\d+(?:\.\d+)?', price_str.replace(',', ''))
+        if match:
+            return float(match.group())
         return 0.0
     except Exception as e:
         logger.error(f"Error cleaning price: {str(e)}")
         return 0.0
 
 def get_driver():
-    chrome_options = Options()
+    webdriver = lazy_import("selenium.webdriver")
+    chrome_options = lazy_import("selenium.webdriver.chrome.options").Options()
     chrome_options.add_argument('--headless')
     chrome_options.add_argument('--no-sandbox')
     chrome_options.add_argument('--disable-dev-shm-usage')
@@ -169,17 +727,28 @@ def get_driver():
     chrome_options.add_argument('--disable-popup-blocking')
     chrome_options.add_argument('--disable-web-security')
     chrome_options.add_argument('--ignore-certificate-errors')
-    chrome_options.add_argument('--user-agent=Mozilla/5.0 (Windows NT 10.0; Win64; x64) AppleWebKit/537.36 (KHTML, like Gecko) Chrome/120.0.0.0 Safari/537.36')
+    chrome_options.add_argument(f'--user-agent={USER_AGENT}')
+    chrome_options.add_argument('--mute-audio')
+    chrome_options.page_load_strategy = PAGE_LOAD_STRATEGY
     
     # Add additional preferences
     chrome_options.add_experimental_option('excludeSwitches', ['enable-automation'])
     chrome_options.add_experimental_option('useAutomationExtension', False)
+    chrome_options.add_experimental_option('prefs', {
+        'profile.managed_default_content_settings.images': 2 if BLOCK_IMAGES else 1,
+        'profile.default_content_setting_values.notifications': 2,
+        'profile.default_content_setting_values.geolocation': 2,
+    })
     
+    service = lazy_import("selenium.webdriver.chrome.service").Service(
+        env={**os.environ, CHROME_OWNER_ENV: CHROME_OWNER}
+    )
+
     try:
-        driver = webdriver.Chrome(options=chrome_options)
+        driver = webdriver.Chrome(options=chrome_options, service=service)
         # Execute CDP commands to prevent detection
         driver.execute_cdp_cmd('Network.setUserAgentOverride', {
-            "userAgent": 'Mozilla/5.0 (Windows NT 10.0; Win64; x64) AppleWebKit/537.36 (KHTML, like Gecko) Chrome/120.0.0.0 Safari/537.36'
+            "userAgent": USER_AGENT
         })
         driver.execute_cdp_cmd('Page.addScriptToEvaluateOnNewDocument', {
             'source': '''
@@ -188,206 +757,2181 @@ def get_driver():
                 })
             '''
         })
+        # Needed for the per-platform URL block lists set before each scrape
+        driver.execute_cdp_cmd('Network.enable', {})
         return driver
     except Exception as e:
         logger.error(f"Error creating Chrome driver: {str(e)}")
         raise
 
-def scrape_amazon(product_name: str) -> Dict:
+CHROME_PROCESS_NAMES = ("chrome", "chromium", "chromedriver", "headless_shell")
+
+def is_chrome_process(process) -> bool:
+    try:
+        name = process.name().lower()
+    except (psutil.NoSuchProcess, psutil.AccessDenied):
+        return False
+    return any(chrome in name for chrome in CHROME_PROCESS_NAMES)
+
+def is_own_chrome(process) -> bool:
+    """Whether this server launched the process (see CHROME_OWNER)."""
+    try:
+        return process.environ().get(CHROME_OWNER_ENV) == CHROME_OWNER
+    except (psutil.NoSuchProcess, psutil.AccessDenied):
+        return False
+
+def process_tree(pid: Optional[int]) -> List:
+    """A process and all its descendants (empty if it is gone or psutil is missing)."""
+    if psutil is None or pid is None:
+        return []
     try:
-        driver = get_driver()
-        search_url = f"https://www.amazon.in/s?k={product_name.replace(' ', '+')}"
-        logger.info(f"Scraping Amazon: {search_url}")
-        
-        driver.get(search_url)
-        time.sleep(5)  # Increased wait time
-        
-        # Wait for product elements with increased timeout
+        root = psutil.Process(pid)
+        return [root] + root.children(recursive=True)
+    except psutil.NoSuchProcess:
+        return []
+
+def process_tree_rss(processes: List) -> int:
+    rss = 0
+    for process in processes:
         try:
-            product = WebDriverWait(driver, 15).until(
-                EC.presence_of_element_located((By.CSS_SELECTOR, '[data-component-type="s-search-result"]'))
-            )
-            
-            # Try different price selectors
-            price_element = None
-            for selector in ['span.a-price-whole', 'span.a-offscreen', 'span.a-price']:
-                try:
-                    price_element = WebDriverWait(driver, 5).until(
-                        EC.presence_of_element_located((By.CSS_SELECTOR, selector))
-                    )
-                    if price_element:
+            rss += process.memory_info().rss
+        except (psutil.NoSuchProcess, psutil.AccessDenied):
+            pass
+    return rss
+
+def kill_processes(processes: List) -> int:
+    """Kill the given processes and reap them; returns how many were still running."""
+    alive = []
+    for process in processes:
+        try:
+            process.kill()
+            alive.append(process)
+        except psutil.NoSuchProcess:
+            pass
+        except psutil.AccessDenied as e:
+            logger.warning(f"Cannot kill Chrome process {process.pid}: {str(e)}")
+    # Waiting also reaps our own children so they don't linger as zombies
+    psutil.wait_procs(alive, timeout=5)
+    return len(alive)
+
+class PooledDriver:
+    def __init__(self, driver):
+        self.driver = driver
+        self.uses = 0
+        self.created_at = time.time()
+        self.checked_out_at = None
+        self.rss = 0
+        # Set by the watchdog: discard instead of reusing when it comes back
+        self.recycle_reason = None
+        # chromedriver's pid; Chrome itself runs as its descendants
+        service = getattr(driver, "service", None)
+        process = getattr(service, "process", None)
+        self.pid = getattr(process, "pid", None)
+
+class DriverPool:
+    """Bounded pool of warm Chrome drivers shared by all scrapers."""
+
+    def __init__(self, factory, size: int, max_uses: int, checkout_timeout: float):
+        self.factory = factory
+        self.size = size
+        self.max_uses = max_uses
+        self.checkout_timeout = checkout_timeout
+        self._idle = deque()
+        self._in_use = {}
+        self._live = 0
+        self._closed = False
+        self._cond = threading.Condition()
+        # chromedriver pids of every live driver, including ones between idle and in use
+        self._pids = set()
+
+    def _create(self) -> PooledDriver:
+        start = time.time()
+        entry = PooledDriver(self.factory())
+        if entry.pid is not None:
+            with self._cond:
+                self._pids.add(entry.pid)
+        metrics.observe("driver_start_seconds", time.time() - start)
+        logger.info(f"Launched pooled Chrome driver in {time.time() - start:.2f}s")
+        return entry
+
+    def _destroy(self, entry: PooledDriver):
+        # Remember the tree first: once chromedriver exits, Chrome is no longer its child
+        processes = process_tree(entry.pid)
+        try:
+            entry.driver.quit()
+        except Exception as e:
+            logger.warning(f"Error quitting Chrome driver: {str(e)}")
+        leftover = [process for process in processes if process.is_running()]
+        if leftover:
+            # quit() failed or left children behind; kill them rather than leak them
+            killed = kill_processes(leftover)
+            if killed:
+                logger.warning(f"Killed {killed} Chrome processes left after quit")
+                metrics.inc("driver_processes_killed_total", {"reason": "quit_failed"}, killed)
+        with self._cond:
+            self._pids.discard(entry.pid)
+
+    def _is_healthy(self, entry: PooledDriver) -> bool:
+        try:
+            entry.driver.execute_script("return 1")
+            return True
+        except Exception as e:
+            logger.warning(f"Discarding unhealthy Chrome driver: {str(e)}")
+            return False
+
+    def _reset(self, entry: PooledDriver):
+        driver = entry.driver
+        # Close any tabs the page opened and go back to a blank first tab
+        handles = driver.window_handles
+        for handle in handles[1:]:
+            driver.switch_to.window(handle)
+            driver.close()
+        driver.switch_to.window(handles[0])
+        driver.delete_all_cookies()
+        driver.get("about:blank")
+
+    def acquire(self, timeout: float = None, label: str = "pool"):
+        with timed(label, "checkout"):
+            return self._acquire(timeout)
+
+    def _acquire(self, timeout: float = None):
+        if timeout is None:
+            timeout = self.checkout_timeout
+        deadline = time.time() + timeout
+        while True:
+            entry = None
+            with self._cond:
+                while True:
+                    if self._closed:
+                        raise RuntimeError("Driver pool is closed")
+                    if self._idle:
+                        entry = self._idle.popleft()
                         break
-                except:
-                    continue
-            
-            # Try different link selectors
-            link_element = None
-            for selector in ['a.a-link-normal.s-no-outline', 'a.a-link-normal.s-underline-text', 'a.a-link-normal']:
-                try:
-                    link_element = WebDriverWait(driver, 5).until(
-                        EC.presence_of_element_located((By.CSS_SELECTOR, selector))
-                    )
-                    if link_element:
+                    if self._live < self.size:
+                        self._live += 1
                         break
-                except:
+                    remaining = deadline - time.time()
+                    if remaining <= 0:
+                        raise TimeoutError(f"No Chrome driver available after {timeout}s")
+                    self._cond.wait(remaining)
+
+            if entry is None:
+                try:
+                    entry = self._create()
+                except Exception:
+                    with self._cond:
+                        self._live -= 1
+                        self._cond.notify()
+                    raise
+            elif not self._is_healthy(entry):
+                self._discard(entry)
+                continue
+
+            entry.checked_out_at = time.time()
+            with self._cond:
+                self._in_use[id(entry.driver)] = entry
+            return entry.driver
+
+    def _discard(self, entry: PooledDriver):
+        self._destroy(entry)
+        with self._cond:
+            self._live -= 1
+            self._cond.notify()
+
+    def release(self, driver, discard: bool = False):
+        with self._cond:
+            entry = self._in_use.pop(id(driver), None)
+        if entry is None:
+            return
+        entry.uses += 1
+
+        if not discard and entry.uses >= self.max_uses:
+            logger.info(f"Recycling Chrome driver after {entry.uses} uses")
+            discard = True
+        if not discard and entry.recycle_reason is not None:
+            logger.info(f"Recycling Chrome driver flagged by the watchdog ({entry.recycle_reason})")
+            metrics.inc("driver_recycled_total", {"reason": entry.recycle_reason})
+            discard = True
+        if not discard:
+            try:
+                self._reset(entry)
+            except Exception as e:
+                logger.warning(f"Error resetting Chrome driver: {str(e)}")
+                discard = True
+
+        if discard or self._closed:
+            self._discard(entry)
+            return
+        with self._cond:
+            self._idle.append(entry)
+            self._cond.notify()
+
+    @contextmanager
+    def checkout(self, timeout: float = None, label: str = "pool"):
+        driver = self.acquire(timeout, label)
+        try:
+            yield driver
+        except Exception:
+            # The driver may be wedged after an unexpected error, so don't reuse it
+            self.release(driver, discard=True)
+            raise
+        else:
+            self.release(driver)
+
+    def prewarm(self, count: int = None):
+        count = min(self.size if count is None else count, self.size)
+        while True:
+            with self._cond:
+                if self._closed or self._live >= count:
+                    break
+                self._live += 1
+            try:
+                entry = self._create()
+            except Exception as e:
+                logger.error(f"Error prewarming Chrome driver: {str(e)}")
+                with self._cond:
+                    self._live -= 1
+                    self._cond.notify()
+                break
+            with self._cond:
+                self._idle.append(entry)
+                self._cond.notify()
+        logger.info(f"Driver pool warm: {self.stats()}")
+
+    def inspect(self):
+        """Watchdog pass: measure every driver's process tree and act on the limits."""
+        with self._cond:
+            idle = list(self._idle)
+            busy = list(self._in_use.values())
+        now = time.time()
+
+        for entry in idle + busy:
+            entry.rss = process_tree_rss(process_tree(entry.pid))
+
+        for entry in idle:
+            reason = self._recycle_reason(entry, now)
+            if reason is None:
+                continue
+            with self._cond:
+                if entry not in self._idle:
                     continue
-            
-            price = clean_price(price_element.text) if price_element else 0
-            link = link_element.get_attribute('href') if link_element else ""
-            
-            logger.info(f"Amazon found: Price={price}, Link={link}")
-            driver.quit()
+                self._idle.remove(entry)
+            logger.info(f"Watchdog recycling idle Chrome driver ({reason}, {entry.rss / 2**20:.0f} MB)")
+            metrics.inc("driver_recycled_total", {"reason": reason})
+            self._discard(entry)
+
+        for entry in busy:
+            if entry.rss > DRIVER_KILL_RSS_MB * 2**20:
+                reason = "memory_limit"
+            elif entry.checked_out_at and now - entry.checked_out_at > DRIVER_MAX_SESSION_SECONDS:
+                reason = "stuck"
+            else:
+                entry.recycle_reason = entry.recycle_reason or self._recycle_reason(entry, now)
+                continue
+            # Killing the browser fails the scrape, and checkout() then discards the driver
+            logger.warning(f"Watchdog killing Chrome session ({reason}, {entry.rss / 2**20:.0f} MB)")
+            killed = kill_processes(process_tree(entry.pid))
+            metrics.inc("driver_processes_killed_total", {"reason": reason}, killed)
+
+    @staticmethod
+    def _recycle_reason(entry: PooledDriver, now: float) -> Optional[str]:
+        if entry.rss > DRIVER_MAX_RSS_MB * 2**20:
+            return "memory"
+        if now - entry.created_at > DRIVER_MAX_AGE:
+            return "age"
+        return None
+
+    def tracked_pids(self) -> set:
+        with self._cond:
+            return set(self._pids)
+
+    def stats(self) -> Dict:
+        with self._cond:
+            entries = list(self._idle) + list(self._in_use.values())
             return {
-                "platform": "Amazon",
-                "price": price,
-                "link": link
+                "size": self.size,
+                "live": self._live,
+                "idle": len(self._idle),
+                "in_use": len(self._in_use),
+                "rss_bytes": sum(entry.rss for entry in entries),
             }
-        except TimeoutException:
-            logger.warning("No product found on Amazon")
-            driver.quit()
-    except Exception as e:
-        logger.error(f"Amazon scraping error: {str(e)}")
+
+    def close(self):
+        with self._cond:
+            self._closed = True
+            idle = list(self._idle)
+            self._idle.clear()
+            self._cond.notify_all()
+        for entry in idle:
+            self._discard(entry)
+
+driver_pool = DriverPool(get_driver, DRIVER_POOL_SIZE, DRIVER_MAX_USES, DRIVER_CHECKOUT_TIMEOUT)
+
+def reap_orphans(tracked_pids: set) -> int:
+    """Kill Chrome process trees we launched that nobody owns any more.
+
+    An orphan is a chrome/chromedriver process re-parented to init (or to us, when
+    we are PID 1 in a container) that isn't one of our pool's drivers. Browsers
+    started by anyone else on the host never carry our CHROME_OWNER tag.
+    """
+    parents = {1, os.getpid()}
+    now = time.time()
+    reaped = 0
+    for process in psutil.process_iter(["ppid", "create_time", "status"]):
+        info = process.info
+        if info["ppid"] not in parents or process.pid in tracked_pids or not is_chrome_process(process):
+            continue
+        if info["status"] == psutil.STATUS_ZOMBIE:
+            # Only our own children are ours to reap; init waits for the rest
+            if info["ppid"] == os.getpid():
+                reaped += kill_processes([process])
+            continue
+        if not is_own_chrome(process):
+            continue
+        # Drivers still starting up aren't in the pool yet
+        if now - (info["create_time"] or now) < DRIVER_ORPHAN_GRACE:
+            continue
+        logger.warning(f"Reaping orphaned Chrome process {process.pid}")
+        reaped += kill_processes(process_tree(process.pid))
+    if reaped:
+        metrics.inc("driver_processes_killed_total", {"reason": "orphan"}, reaped)
+    return reaped
+
+class DriverWatchdog:
+    """Background thread that keeps the pool's Chrome processes within their limits."""
+
+    def __init__(self, pool: DriverPool, interval: float):
+        self.pool = pool
+        self.interval = interval
+        self._stop = threading.Event()
+        self._thread = None
+
+    def _run(self):
+        while not self._stop.wait(self.interval):
+            try:
+                self.pool.inspect()
+                reap_orphans(self.pool.tracked_pids())
+            except Exception as e:
+                logger.error(f"Driver watchdog error: {str(e)}")
+
+    def start(self):
+        if self.interval <= 0 or self._thread is not None:
+            return
+        if psutil is None:
+            logger.warning("psutil is not installed; the driver watchdog is off")
+            return
+        self._thread = threading.Thread(target=self._run, name="driver-watchdog", daemon=True)
+        self._thread.start()
+
+    def stop(self):
+        self._stop.set()
+
+driver_watchdog = DriverWatchdog(driver_pool, DRIVER_WATCHDOG_INTERVAL)
+
+def chrome_process_stats() -> Dict:
+    """Count and memory of every Chrome process under this process (worker processes included)."""
+    processes, sessions = [], 0
+    for process in process_tree(os.getpid())[1:]:
         try:
-            driver.quit()
-        except:
-            pass
-    return {"platform": "Amazon", "price": 0, "link": ""}
+            name = process.name().lower()
+        except (psutil.NoSuchProcess, psutil.AccessDenied):
+            continue
+        if any(chrome in name for chrome in CHROME_PROCESS_NAMES):
+            processes.append(process)
+            sessions += "chromedriver" in name
+    return {"sessions": sessions, "processes": len(processes), "rss_bytes": process_tree_rss(processes)}
+
+@startup_stage("driver_watchdog")
+async def start_driver_watchdog():
+    driver_watchdog.start()
+
+@shutdown_stage
+async def close_driver_pool():
+    driver_watchdog.stop()
+    driver_pool.close()
+    scrape_executor.shutdown(wait=False)
+    if scrape_processes is not None:
+        scrape_processes.shutdown()
+
+def empty_result(platform: str, status: str = "empty") -> Dict:
+    return {
+        "platform": platform,
+        "status": status,
+        "price": 0,
+        "link": "",
+        "title": "",
+        "mrp": 0,
+        "sponsored": False,
+        "candidates": [],
+    }
+
+# Query words whose position changes the meaning ("case for iphone"), so such
+# queries keep their word order in the canonical key
+QUERY_CONNECTORS = {"for", "with", "without", "and", "or", "not", "of", "in", "on", "to", "vs"}
+# Kept inside a word ("usb-c", "5.5", "128/256") or, for QUERY_SUFFIX_CHARS, at its
+# end ("c++", "c#"); elsewhere punctuation becomes a space
+QUERY_INNER_CHARS = ".-/+&"
+QUERY_SUFFIX_CHARS = "+#"
+QUERY_DROPPED_CHARS = "'\u2019`"
+
+def clean_query(product_name: str) -> str:
+    """Fold case, width, accents, punctuation and whitespace, keeping the word order."""
+    text = unicodedata.normalize("NFKD", unicodedata.normalize("NFKC", product_name).casefold())
+    chars = []
+    for i, char in enumerate(text):
+        category = unicodedata.category(char)
+        if category == "Mn" and chars and chars[-1].isascii():
+            # Accent on a Latin letter ("café"); other scripts need their marks
+            continue
+        if char in QUERY_DROPPED_CHARS:
+            continue
+        if category[0] in "PS":
+            inner = (
+                char in QUERY_INNER_CHARS
+                and chars and chars[-1].isalnum()
+                and i + 1 < len(text) and text[i + 1].isalnum()
+            )
+            suffix = char in QUERY_SUFFIX_CHARS and chars and (chars[-1].isalnum() or chars[-1] in QUERY_SUFFIX_CHARS)
+            if not (inner or suffix):
+                char = " "
+        chars.append(char)
+    return " ".join(unicodedata.normalize("NFC", "".join(chars)).split())
+
+def canonical_query(product_name: str) -> str:
+    """Key shared by the cache, single-flight, history and watchlist for one search."""
+    words = clean_query(product_name).split()
+    if not QUERY_CONNECTORS.intersection(words):
+        # Plain keyword lists mean the same in any order
+        words.sort()
+    return " ".join(words)
+
+def pick_best(product_name: str, listings: List[Dict]) -> Optional[Dict]:
+    """Cheapest organic listing whose title mentions every query word."""
+    priced = [listing for listing in listings if listing["price"] > 0]
+    organic = [listing for listing in priced if not listing["sponsored"]] or priced
+    words = clean_query(product_name).split()
+    titles = {id(listing): clean_query(listing["title"]) for listing in organic}
+    matching = [
+        listing for listing in organic
+        if all(word in titles[id(listing)] for word in words)
+    ]
+    candidates = matching or organic
+    if not candidates:
+        return listings[0] if listings else None
+    # Accessories ("case for iphone 15") match the words but cost a fraction of the product
+    floor = statistics.median(listing["price"] for listing in candidates) * ACCESSORY_PRICE_RATIO
+    candidates = [listing for listing in candidates if listing["price"] >= floor]
+    return min(candidates, key=lambda listing: listing["price"])
+
+def build_result(platform: str, product_name: str, listings: List[Dict]) -> Dict:
+    result = empty_result(platform)
+    best = pick_best(product_name, listings)
+    if best is not None:
+        result.update(best)
+    if result["price"] > 0:
+        result["status"] = "ok"
+    elif listings and not any(listing["price"] for listing in listings):
+        # Cards rendered but no price selector matched: the markup has most likely changed
+        result["status"] = "parse_error"
+    else:
+        result["status"] = "empty"
+    result["candidates"] = listings
+    return result
+
+def build_search_url(platform: str, product_name: str) -> str:
+    config = PLATFORMS[platform]
+    query = clean_query(product_name)
+    encoded = quote_plus(query) if config["query_space"] == "+" else quote(query, safe="")
+    return config["search_url"].format(query=encoded)
+
+http_session = None
+http_session_lock = threading.Lock()
+
+def get_http_session():
+    """Keep-alive session shared by every scraper thread, created on first use."""
+    global http_session
+    with http_session_lock:
+        if http_session is None:
+            requests = lazy_import("requests")
+            session = requests.Session()
+            session.headers.update({
+                "User-Agent": USER_AGENT,
+                "Accept": "text/html,application/xhtml+xml,application/xml;q=0.9,*/*;q=0.8",
+                "Accept-Language": "en-IN,en;q=0.9",
+            })
+            adapter = requests.adapters.HTTPAdapter(pool_connections=len(PLATFORMS), pool_maxsize=SCRAPE_WORKERS)
+            session.mount("https://", adapter)
+            session.mount("http://", adapter)
+            http_session = session
+        return http_session
+
+def preload_modules():
+    """Import what the scrapers need ahead of the first request."""
+    get_http_session()
+    lazy_import("bs4")
+    if HTML_PARSER == "lxml":
+        lazy_import("lxml")
+    if FETCH_MODE != "http":
+        lazy_import("selenium.webdriver")
+        lazy_import("selenium.webdriver.chrome.options")
+        lazy_import("selenium.common.exceptions")
+
+# Card fields looked up through the selector registry
+SELECTOR_FIELDS = ("price", "mrp", "link", "title", "sponsored")
+
+class SelectorRegistry:
+    """Hit rate and lookup latency of each platform's fallback selectors.
+
+    Selectors are tried in order of their recent hit rate, declared order breaking
+    ties, so once the markup settles the common path is a single lookup. Catch-all
+    selectors (a platform's "catch_all") match whatever the specific ones match and
+    more, so they would always win on hit rate; they stay after the specific ones
+    and are ranked only among themselves.
+    """
+
+    def __init__(self, path: str, save_interval: float):
+        self.path = path
+        self.save_interval = save_interval
+        self._stats = {}
+        self._lock = threading.Lock()
+        self._dirty = False
+        self._last_save = time.monotonic()
+        # Lookups not yet shipped to the API process (worker processes only)
+        self._pending = None
+        self.load()
+
+    def _entry(self, platform: str, field: str, selector: str) -> Dict:
+        key = (platform, field, selector)
+        entry = self._stats.get(key)
+        if entry is None:
+            # Untried selectors start in the middle so a failing favourite drops below them
+            entry = self._stats[key] = {"attempts": 0, "hits": 0, "score": 0.5, "timed": 0, "seconds": 0.0}
+        return entry
+
+    def ordered(self, platform: str, field: str) -> List[str]:
+        selectors = PLATFORMS[platform][field]
+        catch_all = PLATFORMS[platform]["catch_all"]
+        with self._lock:
+            scores = [self._entry(platform, field, selector)["score"] for selector in selectors]
+        order = sorted(range(len(selectors)), key=lambda i: (selectors[i] in catch_all, -scores[i]))
+        return [selectors[i] for i in order]
+
+    def record(self, platform: str, field: str, lookups: List[tuple]):
+        """Record (selector, hit, seconds or None) lookups from one page."""
+        totals = {}
+        for selector, hit, seconds in lookups:
+            attempts, hits, timed, elapsed = totals.get(selector, (0, 0, 0, 0.0))
+            totals[selector] = (
+                attempts + 1, hits + hit,
+                timed + (seconds is not None), elapsed + (seconds or 0.0),
+            )
+        with self._lock:
+            for selector, (attempts, hits, timed, elapsed) in totals.items():
+                entry = self._entry(platform, field, selector)
+                entry["attempts"] += attempts
+                entry["hits"] += hits
+                entry["timed"] += timed
+                entry["seconds"] += elapsed
+                # Same as applying the decay once per lookup, at page granularity
+                weight = 1 - (1 - SELECTOR_SCORE_DECAY) ** attempts
+                entry["score"] += weight * (hits / attempts - entry["score"])
+            self._dirty = True
+            if self._pending is not None:
+                self._pending.append((platform, field, lookups))
+        if time.monotonic() - self._last_save >= self.save_interval:
+            self.save()
+
+    def collect(self):
+        """In a worker process: keep new lookups for take() and leave saving to the API process."""
+        with self._lock:
+            self._pending = []
+            self.path = ""
+
+    def take(self) -> List[tuple]:
+        with self._lock:
+            recorded = self._pending or []
+            if self._pending is not None:
+                self._pending = []
+        return recorded
+
+    def merge(self, recorded: List[tuple]):
+        for platform, field, lookups in recorded:
+            self.record(platform, field, lookups)
+
+    def stats(self) -> Dict:
+        report = {}
+        for platform, config in PLATFORMS.items():
+            report[platform] = {}
+            for field in SELECTOR_FIELDS:
+                order = self.ordered(platform, field)
+                with self._lock:
+                    entries = [(selector, dict(self._entry(platform, field, selector))) for selector in order]
+                report[platform][field] = [
+                    {
+                        "selector": selector,
+                        "attempts": entry["attempts"],
+                        "hits": entry["hits"],
+                        "score": round(entry["score"], 3),
+                        "avg_ms": round(entry["seconds"] / entry["timed"] * 1000, 3) if entry["timed"] else None,
+                    }
+                    for selector, entry in entries
+                ]
+        return report
+
+    def load(self):
+        if not self.path or not os.path.exists(self.path):
+            return
+        try:
+            with open(self.path) as f:
+                saved = json.load(f)
+        except (OSError, ValueError) as e:
+            logger.warning(f"Could not load selector stats: {str(e)}")
+            return
+        with self._lock:
+            for item in saved:
+                key = (item["platform"], item["field"], item["selector"])
+                self._stats[key] = {name: item[name] for name in ("attempts", "hits", "score", "timed", "seconds")}
+
+    def save(self):
+        with self._lock:
+            self._last_save = time.monotonic()
+            if not self.path or not self._dirty:
+                return
+            items = [
+                {"platform": platform, "field": field, "selector": selector, **entry}
+                for (platform, field, selector), entry in self._stats.items()
+            ]
+            self._dirty = False
+        try:
+            # Write then rename so a crash never leaves a half-written file
+            temp_path = f"{self.path}.{os.getpid()}.tmp"
+            with open(temp_path, "w") as f:
+                json.dump(items, f)
+            os.replace(temp_path, self.path)
+        except OSError as e:
+            logger.warning(f"Could not save selector stats: {str(e)}")
+
+selector_registry = SelectorRegistry(SELECTOR_STATS_PATH, SELECTOR_STATS_SAVE_INTERVAL)
+
+@shutdown_stage
+async def save_selector_stats():
+    selector_registry.save()
+
+def select_first(element, selectors: List[str], lookups: List[tuple] = None):
+    for selector in selectors:
+        start = time.perf_counter()
+        match = element.select_one(selector)
+        if lookups is not None:
+            lookups.append((selector, match is not None, time.perf_counter() - start))
+        if match is not None:
+            return match
+    return None
+
+def parse_search_html(platform: str, html: str, base_url: str, top_n: int) -> Optional[List[Dict]]:
+    config = PLATFORMS[platform]
+    soup = lazy_import("bs4").BeautifulSoup(html, HTML_PARSER)
+    matches = soup.select(config["product"])
+    # Skip matches nested inside another match (the selector lists wrapper and inner classes)
+    matched = set(map(id, matches))
+    cards = [card for card in matches if not any(id(parent) in matched for parent in card.parents)]
+    selectors = {field: selector_registry.ordered(platform, field) for field in SELECTOR_FIELDS}
+    lookups = {field: [] for field in SELECTOR_FIELDS}
+    listings = []
+    for card in cards[:top_n]:
+        found = {field: select_first(card, selectors[field], lookups[field]) for field in SELECTOR_FIELDS}
+        price, mrp, link, title = found["price"], found["mrp"], found["link"], found["title"]
+        listings.append({
+            "price": clean_price(price.get_text()) if price else 0,
+            "mrp": clean_price(mrp.get_text()) if mrp else 0,
+            "link": urljoin(base_url, link.get('href', '')) if link else "",
+            "title": title.get_text(strip=True) if title else "",
+            "sponsored": found["sponsored"] is not None,
+        })
+    for field in SELECTOR_FIELDS:
+        selector_registry.record(platform, field, lookups[field])
+    # No priced card means the listing is rendered client-side
+    if not any(listing["price"] for listing in listings):
+        return None
+    return listings
+
+def scrape_http(platform: str, product_name: str, top_n: int) -> Optional[Dict]:
+    """Fetch the search page without a browser; None means Selenium is needed."""
+    search_url = build_search_url(platform, product_name)
+    logger.info(f"Fetching {platform} over HTTP: {search_url}")
+    try:
+        with timed(platform, "http_fetch"):
+            response = get_http_session().get(search_url, timeout=HTTP_TIMEOUT)
+    except lazy_import("requests").RequestException as e:
+        logger.warning(f"{platform} HTTP fetch failed: {str(e)}")
+        return None
+    if response.status_code != 200:
+        logger.info(f"{platform} HTTP fetch returned {response.status_code}")
+        return None
+
+    try:
+        with timed(platform, "parse"):
+            listings = parse_search_html(platform, response.text, response.url, top_n)
+    except Exception as e:
+        logger.warning(f"{platform} HTML parsing error: {str(e)}")
+        return None
+    if listings is None:
+        logger.info(f"{platform} page has no server-rendered results")
+        return None
+    result = build_result(platform, product_name, listings)
+    logger.info(f"{platform} found over HTTP: Price={result['price']}, Link={result['link']}")
+    return result
+
+# Reads the first N product cards and every candidate selector in one round-trip.
+# With no card yet, reports whether the page has finished loading or shows the
+# platform's no-results marker so the caller knows whether to keep polling.
+EXTRACT_SCRIPT = """
+const spec = arguments[0];
+// Skip matches nested inside another match (the selector lists wrapper and inner classes)
+const cards = Array.from(document.querySelectorAll(spec.product))
+    .filter(card => !card.parentElement || !card.parentElement.closest(spec.product))
+    .slice(0, spec.limit);
+if (!cards.length) {
+    return {
+        cards: null,
+        loaded: document.readyState === "complete",
+        no_results: document.querySelector(spec.no_results) !== null
+    };
+}
+// Also report which selector matched each field (-1 for none) for the selector registry
+const first = (card, field, hits) => {
+    const selectors = spec[field];
+    for (let i = 0; i < selectors.length; i++) {
+        const element = card.querySelector(selectors[i]);
+        if (element) {
+            hits[field] = i;
+            return element;
+        }
+    }
+    hits[field] = -1;
+    return null;
+};
+const text = (element) => element ? element.textContent.trim() : "";
+return {cards: cards.map(card => {
+    const hits = {};
+    const link = first(card, "link", hits);
+    return {
+        price: text(first(card, "price", hits)),
+        mrp: text(first(card, "mrp", hits)),
+        link: link ? link.href : "",
+        title: text(first(card, "title", hits)),
+        sponsored: first(card, "sponsored", hits) !== null,
+        hits: hits
+    };
+})};
+"""
+
+class AdaptiveDeadline:
+    """Tracks how long successful extractions take and derives a wait deadline from them."""
+
+    def __init__(self, ceiling: float, max_samples: int = 200):
+        self.ceiling = ceiling
+        self._samples = deque(maxlen=max_samples)
+        self._lock = threading.Lock()
+        # Samples not yet shipped to the API process (worker processes only)
+        self._pending = None
+
+    def observe(self, seconds: float):
+        with self._lock:
+            self._samples.append(seconds)
+            if self._pending is not None:
+                self._pending.append(seconds)
+
+    def collect(self):
+        """Keep new samples for take(), in a worker process."""
+        with self._lock:
+            self._pending = []
+
+    def take(self) -> List[float]:
+        with self._lock:
+            samples = self._pending or []
+            if self._pending is not None:
+                self._pending = []
+        return samples
+
+    def merge(self, samples: List[float]):
+        with self._lock:
+            self._samples.extend(samples)
+
+    def current(self) -> float:
+        with self._lock:
+            samples = sorted(self._samples)
+        if not ADAPTIVE_DEADLINES or len(samples) < ADAPTIVE_MIN_SAMPLES:
+            return self.ceiling
+        index = min(len(samples) - 1, int(len(samples) * ADAPTIVE_DEADLINE_PERCENTILE / 100))
+        return max(ADAPTIVE_DEADLINE_MIN, min(self.ceiling, samples[index] * ADAPTIVE_DEADLINE_FACTOR))
+
+scrape_deadlines = {platform: AdaptiveDeadline(SCRAPE_DEADLINES[platform]) for platform in PLATFORMS}
+
+def extract_when_ready(driver, platform: str, top_n: int, start: float, deadline: float) -> Optional[List[Dict]]:
+    """Poll the page until a listing price renders or the scrape's deadline passes.
+
+    Returns [] as soon as the page has settled with no results, and None if no
+    product card appeared before the deadline.
+    """
+    spec = {field: selector_registry.ordered(platform, field) for field in SELECTOR_FIELDS}
+    spec["product"] = PLATFORMS[platform]["product"]
+    spec["no_results"] = PLATFORMS[platform]["no_results"]
+    spec["limit"] = top_n
+    cards = None
+    loaded_at = None
+    while True:
+        page = driver.execute_script(EXTRACT_SCRIPT, spec)
+        cards = page["cards"] or cards
+        now = time.time()
+        if cards and any(card["price"] for card in cards):
+            scrape_deadlines[platform].observe(now - start)
+            break
+        if not cards:
+            # Client-rendered listings can land a little after the load event
+            if page["loaded"] and loaded_at is None:
+                loaded_at = now
+            if page["no_results"] or (loaded_at is not None and now - loaded_at >= SCRAPE_SETTLE_SECONDS):
+                return []
+        if now >= deadline:
+            break
+        time.sleep(SCRAPE_POLL_INTERVAL)
+    if cards is None:
+        return None
+    for field in SELECTOR_FIELDS:
+        # Selectors before the matching one missed; the page gives no per-lookup timing
+        lookups = []
+        for card in cards:
+            index = card.get("hits", {}).get(field, -1)
+            tried = spec[field] if index < 0 else spec[field][:index + 1]
+            lookups.extend((selector, i == index, None) for i, selector in enumerate(tried))
+        selector_registry.record(platform, field, lookups)
+    return [
+        {
+            "price": clean_price(card["price"]),
+            "mrp": clean_price(card["mrp"]),
+            "link": card["link"],
+            "title": card["title"],
+            "sponsored": bool(card["sponsored"]),
+        }
+        for card in cards
+    ]
+
+def scrape_selenium(platform: str, product_name: str, top_n: int) -> Dict:
+    try:
+        with driver_pool.checkout(label=platform) as driver:
+            search_url = build_search_url(platform, product_name)
+            logger.info(f"Scraping {platform}: {search_url}")
+            # One deadline covers navigation and waiting for listings to render
+            start = time.time()
+            deadline = start + scrape_deadlines[platform].current()
+            with timed(platform, "navigate"):
+                driver.execute_cdp_cmd('Network.setBlockedURLs', {'urls': BLOCKED_URLS[platform]})
+                driver.set_page_load_timeout(max(deadline - time.time(), 0.1))
+                driver.get(search_url)
+
+            with timed(platform, "extract"):
+                listings = extract_when_ready(driver, platform, top_n, start, deadline)
+            if listings is None:
+                logger.warning(f"No product card rendered on {platform} before the deadline")
+                return empty_result(platform, "timeout")
+
+            result = build_result(platform, product_name, listings)
+            logger.info(f"{platform} found: Price={result['price']}, Link={result['link']}")
+            return result
+    except (TimeoutError, lazy_import("selenium.common.exceptions").TimeoutException) as e:
+        logger.error(f"{platform} scraping timed out: {str(e)}")
+        return empty_result(platform, "timeout")
+    except Exception as e:
+        logger.error(f"{platform} scraping error: {str(e)}")
+    return empty_result(platform, "error")
+
+def scrape_tiered(platform: str, product_name: str, top_n: int) -> Dict:
+    with timed(platform, "total"):
+        result = None
+        if FETCH_MODE in ("auto", "http"):
+            result = scrape_http(platform, product_name, top_n)
+            if result is None and FETCH_MODE == "auto":
+                metrics.inc("http_fallbacks_total", {"platform": platform})
+        if result is None:
+            if FETCH_MODE == "http":
+                result = empty_result(platform)
+            else:
+                result = scrape_selenium(platform, product_name, top_n)
+    metrics.inc("scrape_results_total", {"platform": platform, "outcome": result["status"]})
+    return result
+
+def scrape_amazon(product_name: str, top_n: int = DEFAULT_TOP_N) -> Dict:
+    return scrape_tiered("Amazon", product_name, top_n)
+
+def scrape_flipkart(product_name: str, top_n: int = DEFAULT_TOP_N) -> Dict:
+    return scrape_tiered("Flipkart", product_name, top_n)
+
+def scrape_meesho(product_name: str, top_n: int = DEFAULT_TOP_N) -> Dict:
+    return scrape_tiered("Meesho", product_name, top_n)
+
+SCRAPERS = {
+    "Amazon": scrape_amazon,
+    "Flipkart": scrape_flipkart,
+    "Meesho": scrape_meesho,
+}
+
+scrape_executor = ThreadPoolExecutor(max_workers=SCRAPE_WORKERS, thread_name_prefix="scraper")
 
-def scrape_flipkart(product_name: str) -> Dict:
+class ScrapeJobTimeout(Exception):
+    pass
+
+def init_scrape_worker():
+    """Runs once in each scrape worker process."""
+    driver_pool.size = SCRAPE_PROCESS_DRIVERS
+    # Jobs hand their deadline samples and selector lookups back to the API process,
+    # which reports them and is the only one to save the selector stats
+    for deadline in scrape_deadlines.values():
+        deadline.collect()
+    selector_registry.collect()
+    # Pool workers skip atexit handlers, so quit Chrome from a multiprocessing finalizer
+    multiprocessing.util.Finalize(None, driver_pool.close, exitpriority=10)
+    driver_watchdog.start()
+    preload_modules()
+    if DRIVER_POOL_PREWARM > 0:
+        driver_pool.prewarm(SCRAPE_PROCESS_DRIVERS)
+    logger.info(f"Scrape worker {os.getpid()} ready")
+
+def scrape_worker_ready() -> int:
+    return os.getpid()
+
+def run_scrape_job(scraper, product_name: str, top_n: int):
+    """Entry point of a job in a worker process.
+
+    Returns the result with the job's spans, metrics, adaptive deadline samples and
+    selector lookups, which the API process records.
+    """
+    timings = []
+    request_timings.set(timings)
     try:
-        driver = get_driver()
-        search_url = f"https://www.flipkart.com/search?q={product_name.replace(' ', '%20')}"
-        logger.info(f"Scraping Flipkart: {search_url}")
-        
-        driver.get(search_url)
-        time.sleep(3)  # Wait for page to load
-        
-        # Wait for product elements
+        result = scraper(product_name, top_n)
+    finally:
+        request_timings.set(None)
+    telemetry = {
+        "metrics": metrics.take(),
+        "deadline_samples": {platform: deadline.take() for platform, deadline in scrape_deadlines.items()},
+        "selector_lookups": selector_registry.take(),
+    }
+    return result, timings, telemetry
+
+class ScrapeProcessPool:
+    """Worker processes that run platform jobs with a timeout, retrying jobs whose worker died."""
+
+    def __init__(self, workers: int, job_timeout: float, retries: int):
+        self.workers = workers
+        self.job_timeout = job_timeout
+        self.retries = retries
+        self._executor = None
+        self._lock = threading.Lock()
+        self.restarts = 0
+
+    def _get_executor(self) -> ProcessPoolExecutor:
+        with self._lock:
+            if self._executor is None:
+                # spawn, not fork: forking a process with threads and Chrome children is unsafe
+                self._executor = ProcessPoolExecutor(
+                    max_workers=self.workers,
+                    mp_context=multiprocessing.get_context("spawn"),
+                    initializer=init_scrape_worker,
+                )
+                logger.info(f"Started {self.workers} scrape worker processes")
+            return self._executor
+
+    def _replace(self, broken: ProcessPoolExecutor):
+        with self._lock:
+            if self._executor is broken:
+                self._executor = None
+                self.restarts += 1
+        broken.shutdown(wait=False)
+
+    async def run(self, scraper, product_name: str, top_n: int) -> Dict:
+        attempt = 0
+        while True:
+            attempt += 1
+            executor = self._get_executor()
+            try:
+                future = asyncio.wrap_future(executor.submit(run_scrape_job, scraper, product_name, top_n))
+                result, timings, telemetry = await asyncio.wait_for(future, timeout=self.job_timeout)
+                break
+            except asyncio.TimeoutError:
+                # A job still queued is cancelled; a running one ends at the scraper's own
+                # deadline. Either way the worker isn't free yet, so don't queue a retry behind it.
+                metrics.inc("scrape_job_failures_total", {"reason": "timeout"})
+                logger.warning(f"Scrape job {scraper.__name__} '{product_name}' timed out (attempt {attempt})")
+                raise ScrapeJobTimeout(f"{scraper.__name__} timed out after {self.job_timeout:.0f}s")
+            except BrokenProcessPool:
+                # A worker died (e.g. OOM-killed with its Chrome); start a fresh pool
+                metrics.inc("scrape_job_failures_total", {"reason": "worker_died"})
+                logger.error(f"Scrape worker died running {scraper.__name__} (attempt {attempt})")
+                self._replace(executor)
+                if attempt > self.retries:
+                    raise
+
+        # Record the worker's spans, metrics, deadline samples and selector lookups here,
+        # where /metrics, /platforms/status, /selectors and Server-Timing live
+        metrics.merge(*telemetry["metrics"])
+        for platform, samples in telemetry["deadline_samples"].items():
+            scrape_deadlines[platform].merge(samples)
+        selector_registry.merge(telemetry["selector_lookups"])
+        request_spans = request_timings.get()
+        if request_spans is not None:
+            request_spans.extend(timings)
+        return result
+
+    async def warm(self) -> int:
+        """Start the workers (each prewarms its drivers) and return how many answered."""
+        executor = self._get_executor()
+        pids = await asyncio.gather(*(
+            asyncio.wrap_future(executor.submit(scrape_worker_ready)) for _ in range(self.workers)
+        ))
+        return len(set(pids))
+
+    def stats(self) -> Dict:
+        return {
+            "backend": "process",
+            "workers": self.workers,
+            "started": self._executor is not None,
+            "restarts": self.restarts,
+        }
+
+    def shutdown(self):
+        with self._lock:
+            executor, self._executor = self._executor, None
+        if executor is not None:
+            executor.shutdown(wait=False, cancel_futures=True)
+
+scrape_processes = (
+    ScrapeProcessPool(SCRAPE_PROCESSES, SCRAPE_JOB_TIMEOUT, SCRAPE_JOB_RETRIES)
+    if SCRAPE_BACKEND == "process" else None
+)
+
+async def run_scraper(scraper, product_name: str, top_n: int = DEFAULT_TOP_N) -> Dict:
+    if scrape_processes is not None:
+        return await scrape_processes.run(scraper, product_name, top_n)
+    loop = asyncio.get_running_loop()
+    # Carry the request's context into the worker thread so its spans are recorded
+    context = contextvars.copy_context()
+    return await loop.run_in_executor(
+        scrape_executor, functools.partial(context.run, scraper, product_name, top_n)
+    )
+
+class Readiness:
+    """Startup progress: ready once startup ran and warm scrape capacity exists."""
+
+    def __init__(self):
+        self.started = False
+        self.warm = False
+        self.warm_error = None
+        self.warm_workers = 0
+        self.ready_at = None
+        self._task = None
+
+    def mark_started(self):
+        self.started = True
+        self._check()
+
+    def mark_warm(self, error: str = None):
+        self.warm = True
+        self.warm_error = error
+        self._check()
+
+    def is_ready(self) -> bool:
+        # Without Chrome the HTTP tier can still serve, unless it is switched off
+        return self.started and self.warm and (self.warm_error is None or FETCH_MODE != "selenium")
+
+    def _check(self):
+        if self.ready_at is None and self.is_ready():
+            self.ready_at = time.time()
+            logger.info(f"Ready to serve {self.ready_at - IMPORT_STARTED_AT:.2f}s after import started"
+                        + (f" (degraded: {self.warm_error})" if self.warm_error else ""))
+
+    async def warm_up(self):
+        loop = asyncio.get_running_loop()
         try:
-            product = WebDriverWait(driver, 10).until(
-                EC.presence_of_element_located((By.CSS_SELECTOR, 'div._1AtVbE, div._4rR01T, div.tUxRFH, div._2kHMtA'))
-            )
-            
-            # Try different price selectors
-            price_element = None
-            for selector in ['div._30jeq3', 'div._1_WHN1', 'div._16Jk6d']:
-                try:
-                    price_element = product.find_element(By.CSS_SELECTOR, selector)
-                    if price_element:
-                        break
-                except:
-                    continue
-            
-            # Try different link selectors
-            link_element = None
-            for selector in ['a._1fQZEK', 'a._2UzuFa', 'a.s1Q9rs']:
-                try:
-                    link_element = product.find_element(By.CSS_SELECTOR, selector)
-                    if link_element:
-                        break
-                except:
-                    continue
-            
-            price = clean_price(price_element.text) if price_element else 0
-            link = link_element.get_attribute('href') if link_element else ""
-            
-            logger.info(f"Flipkart found: Price={price}, Link={link}")
-            driver.quit()
+            if scrape_processes is not None:
+                self.warm_workers = await scrape_processes.warm()
+            else:
+                await loop.run_in_executor(None, preload_modules)
+                if FETCH_MODE != "http" and DRIVER_POOL_PREWARM > 0:
+                    await loop.run_in_executor(None, driver_pool.prewarm, DRIVER_POOL_PREWARM)
+                    if driver_pool.stats()["live"] == 0:
+                        self.mark_warm("no Chrome driver could be started")
+                        return
+            self.mark_warm()
+        except Exception as e:
+            logger.error(f"Warm-up failed: {str(e)}")
+            self.mark_warm(str(e))
+
+    def start_warm_up(self):
+        # In the background, so startup (and /healthz) isn't blocked on Chrome
+        self._task = asyncio.create_task(self.warm_up())
+
+    def stop(self):
+        if self._task is not None:
+            self._task.cancel()
+            self._task = None
+
+readiness = Readiness()
+
+@startup_stage("warm_up")
+async def start_warm_up():
+    readiness.start_warm_up()
+
+@shutdown_stage
+async def stop_warm_up():
+    readiness.stop()
+
+class ResultCache:
+    """LRU cache of per-platform results with TTLs and a stale window.
+
+    Only "ok" results are served stale; an expired failure or empty result is a
+    miss, so the next request scrapes again instead of seeing the old answer.
+    """
+
+    def __init__(self, max_size: int, stale_ttl: float):
+        self.max_size = max_size
+        self.stale_ttl = stale_ttl
+        self._entries = OrderedDict()
+        self._lock = threading.Lock()
+        self.hits = 0
+        self.stale_hits = 0
+        self.misses = 0
+
+    def get(self, key):
+        """Return (result, fresh) or None on a miss."""
+        now = time.time()
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is not None:
+                result, stored_at, ttl = entry
+                age = now - stored_at
+                if age <= ttl:
+                    self._entries.move_to_end(key)
+                    self.hits += 1
+                    return dict(result), True
+                if age <= ttl + self.stale_ttl and result.get("status") == "ok":
+                    self._entries.move_to_end(key)
+                    self.stale_hits += 1
+                    return dict(result), False
+                del self._entries[key]
+            self.misses += 1
+            return None
+
+    def set(self, key, result: Dict, ttl: float):
+        with self._lock:
+            self._entries[key] = (dict(result), time.time(), ttl)
+            self._entries.move_to_end(key)
+            while len(self._entries) > self.max_size:
+                self._entries.popitem(last=False)
+
+    def peek(self, key) -> Optional[Dict]:
+        """Last stored result regardless of age, without touching the stats."""
+        with self._lock:
+            entry = self._entries.get(key)
+            return dict(entry[0]) if entry is not None else None
+
+    def clear(self):
+        with self._lock:
+            self._entries.clear()
+
+    def stats(self) -> Dict:
+        with self._lock:
+            lookups = self.hits + self.stale_hits + self.misses
             return {
-                "platform": "Flipkart",
-                "price": price,
-                "link": link
+                "size": len(self._entries),
+                "max_size": self.max_size,
+                "hits": self.hits,
+                "stale_hits": self.stale_hits,
+                "misses": self.misses,
+                "hit_rate": round((self.hits + self.stale_hits) / lookups, 4) if lookups else 0.0,
             }
-        except TimeoutException:
-            logger.warning("No product found on Flipkart")
-            driver.quit()
-    except Exception as e:
-        logger.error(f"Flipkart scraping error: {str(e)}")
+
+class SingleFlight:
+    """Let concurrent callers with the same key share one in-flight call."""
+
+    def __init__(self):
+        self._calls = {}
+        self.coalesced = 0
+
+    def in_flight(self, key) -> bool:
+        return key in self._calls
+
+    async def do(self, key, fn, *args):
+        task = self._calls.get(key)
+        if task is None:
+            task = asyncio.ensure_future(fn(*args))
+            self._calls[key] = task
+            task.add_done_callback(lambda done: self._forget(key, done))
+        else:
+            self.coalesced += 1
+        # Shield the shared task so one caller going away doesn't cancel it for the rest
+        result = await asyncio.shield(task)
+        return dict(result)
+
+    def _forget(self, key, task):
+        if self._calls.get(key) is task:
+            del self._calls[key]
+
+class PriceHistoryStore:
+    """SQLite (WAL) log of scraped prices, written in batches by a background thread."""
+
+    SCHEMA = """
+        CREATE TABLE IF NOT EXISTS observations (
+            id INTEGER PRIMARY KEY,
+            query_key TEXT NOT NULL,
+            query TEXT NOT NULL,
+            platform TEXT NOT NULL,
+            status TEXT NOT NULL,
+            price REAL NOT NULL,
+            mrp REAL NOT NULL,
+            link TEXT NOT NULL,
+            title TEXT NOT NULL,
+            observed_at REAL NOT NULL
+        );
+        CREATE INDEX IF NOT EXISTS idx_observations_query_platform_time
+            ON observations (query_key, platform, observed_at);
+    """
+
+    def __init__(self, path: str, batch_size: int, flush_interval: float):
+        self.path = path
+        self.batch_size = batch_size
+        self.flush_interval = flush_interval
+        self._queue = queue.Queue(maxsize=batch_size * 50)
+        self._local = threading.local()
+        self._writer = None
+        self._stopping = threading.Event()
+
+    def _connect(self) -> sqlite3.Connection:
+        connection = sqlite3.connect(self.path, timeout=10)
+        connection.row_factory = sqlite3.Row
+        connection.execute("PRAGMA journal_mode=WAL")
+        connection.execute("PRAGMA synchronous=NORMAL")
+        connection.executescript(self.SCHEMA)
+        return connection
+
+    def _reader(self) -> sqlite3.Connection:
+        # sqlite3 connections can't be shared across threads, so keep one per reader thread
+        connection = getattr(self._local, "connection", None)
+        if connection is None:
+            connection = self._local.connection = self._connect()
+        return connection
+
+    def start(self):
+        if self._writer is not None:
+            return
+        self._connect().close()
+        self._stopping.clear()
+        self._writer = threading.Thread(target=self._write_loop, name="history-writer", daemon=True)
+        self._writer.start()
+
+    def close(self):
+        if self._writer is None:
+            return
+        self._stopping.set()
+        self._writer.join(timeout=5)
+        self._writer = None
+
+    def record(self, query_key: str, query: str, result: Dict):
+        if self._writer is None:
+            return
+        row = (
+            query_key, query, result["platform"], result.get("status", "ok"),
+            result.get("price", 0), result.get("mrp", 0), result.get("link", ""),
+            result.get("title", ""), result.get("observed_at") or time.time(),
+        )
         try:
-            driver.quit()
-        except:
-            pass
-    return {"platform": "Flipkart", "price": 0, "link": ""}
+            self._queue.put_nowait(row)
+        except queue.Full:
+            logger.warning("Price history queue is full, dropping observation")
 
-def scrape_meesho(product_name: str) -> Dict:
-    try:
-        driver = get_driver()
-        search_url = f"https://www.meesho.com/search?q={product_name.replace(' ', '%20')}"
-        logger.info(f"Scraping Meesho: {search_url}")
-        
-        driver.get(search_url)
-        time.sleep(3)  # Wait for page to load
-        
-        # Wait for product elements
+    def _write_loop(self):
+        connection = self._connect()
         try:
-            product = WebDriverWait(driver, 10).until(
-                EC.presence_of_element_located((By.CSS_SELECTOR, 'div.ProductList__GridCol, div.sc-dkzDqf, div.ProductCard__BaseCard'))
-            )
-            
-            # Try different price selectors
-            price_element = None
-            for selector in ['div.ProductCard__Price', 'div.sc-dkzDqf', 'div.ProductCard__PriceText']:
+            while not (self._stopping.is_set() and self._queue.empty()):
+                batch = []
                 try:
-                    price_element = product.find_element(By.CSS_SELECTOR, selector)
-                    if price_element:
-                        break
-                except:
+                    batch.append(self._queue.get(timeout=self.flush_interval))
+                    while len(batch) < self.batch_size:
+                        batch.append(self._queue.get_nowait())
+                except queue.Empty:
+                    pass
+                if not batch:
                     continue
-            
-            # Try different link selectors
-            link_element = None
-            for selector in ['a.ProductCard__Link', 'a.sc-dkzDqf', 'a.ProductCard__BaseCard']:
                 try:
-                    link_element = product.find_element(By.CSS_SELECTOR, selector)
-                    if link_element:
-                        break
-                except:
-                    continue
-            
-            price = clean_price(price_element.text) if price_element else 0
-            link = link_element.get_attribute('href') if link_element else ""
-            
-            logger.info(f"Meesho found: Price={price}, Link={link}")
-            driver.quit()
-            return {
-                "platform": "Meesho",
-                "price": price,
-                "link": link
-            }
-        except TimeoutException:
-            logger.warning("No product found on Meesho")
-            driver.quit()
-    except Exception as e:
-        logger.error(f"Meesho scraping error: {str(e)}")
-        try:
-            driver.quit()
-        except:
+                    with connection:
+                        connection.executemany(
+                            "INSERT INTO observations (query_key, query, platform, status, price, mrp, link, title, observed_at) "
+                            "VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?)",
+                            batch,
+                        )
+                except sqlite3.Error as e:
+                    logger.error(f"Error writing price history: {str(e)}")
+        finally:
+            connection.close()
+
+    def history(self, query_key: str, since: float, platform: str = None, limit: int = 100) -> List[Dict]:
+        sql = (
+            "SELECT platform, status, price, mrp, link, title, observed_at FROM observations "
+            "WHERE query_key = ? AND observed_at >= ?"
+        )
+        params = [query_key, since]
+        if platform:
+            sql += " AND platform = ?"
+            params.append(platform)
+        sql += " ORDER BY observed_at DESC LIMIT ?"
+        params.append(limit)
+        return [dict(row) for row in self._reader().execute(sql, params)]
+
+    def summary(self, query_key: str, since: float) -> List[Dict]:
+        rows = self._reader().execute(
+            "SELECT platform, COUNT(*) AS observations, MIN(price) AS min_price, MAX(price) AS max_price, "
+            "AVG(price) AS avg_price, MAX(observed_at) AS last_observed_at FROM observations "
+            "WHERE query_key = ? AND observed_at >= ? AND status = 'ok' AND price > 0 "
+            "GROUP BY platform ORDER BY platform",
+            (query_key, since),
+        )
+        return [dict(row) for row in rows]
+
+    def latest(self, query_key: str, platform: str, max_age: float) -> Optional[Dict]:
+        row = self._reader().execute(
+            "SELECT platform, status, price, mrp, link, title, observed_at FROM observations "
+            "WHERE query_key = ? AND platform = ? AND observed_at >= ? AND status = 'ok' "
+            "ORDER BY observed_at DESC LIMIT 1",
+            (query_key, platform, time.time() - max_age),
+        ).fetchone()
+        return dict(row) if row else None
+
+history_store = PriceHistoryStore(HISTORY_DB_PATH, HISTORY_BATCH_SIZE, HISTORY_FLUSH_INTERVAL) if HISTORY_DB_PATH else None
+
+@startup_stage("history_store")
+async def start_history_store():
+    if history_store is not None:
+        history_store.start()
+
+@shutdown_stage
+async def close_history_store():
+    if history_store is not None:
+        history_store.close()
+
+async def run_blocking(fn, *args):
+    """Run quick blocking work (like SQLite reads) on the default executor."""
+    return await asyncio.get_running_loop().run_in_executor(None, functools.partial(fn, *args))
+
+async def recent_observation(query_key: str, platform: str, max_age: float = HISTORY_MAX_AGE) -> Optional[Dict]:
+    if history_store is None or max_age <= 0:
+        return None
+    try:
+        row = await run_blocking(history_store.latest, query_key, platform, max_age)
+    except sqlite3.Error as e:
+        logger.error(f"Error reading price history: {str(e)}")
+        return None
+    if row is None:
+        return None
+    result = empty_result(platform, "ok")
+    result.update({key: row[key] for key in ("price", "mrp", "link", "title")})
+    result["observed_at"] = row["observed_at"]
+    return result
+
+class CircuitBreaker:
+    """Short-circuits a platform that keeps timing out or failing.
+
+    closed -> open once the recent failure rate passes the threshold; open ->
+    half_open after the cooldown, letting one probe through; a successful probe
+    closes the breaker again, a failed one reopens it.
+    """
+
+    # A search with no results is "empty" and counts as a success
+    FAILURES = ("timeout", "error", "parse_error")
+
+    def __init__(self, name: str):
+        self.name = name
+        self.state = "closed"
+        self.opened_at = 0.0
+        self.probe_in_flight = False
+        self.short_circuited = 0
+        self._outcomes = deque()
+
+    def _trim(self, now: float):
+        while self._outcomes and now - self._outcomes[0][0] > BREAKER_WINDOW:
+            self._outcomes.popleft()
+
+    def allow(self) -> bool:
+        if self.state == "open" and time.time() - self.opened_at >= BREAKER_COOLDOWN:
+            self.state = "half_open"
+        if self.state == "closed":
+            return True
+        if self.state == "half_open" and not self.probe_in_flight:
+            self.probe_in_flight = True
+            return True
+        self.short_circuited += 1
+        return False
+
+    def record(self, status: str):
+        now = time.time()
+        failed = status in self.FAILURES
+        if self.state == "half_open":
+            self.probe_in_flight = False
+            if failed:
+                self._open(now, "probe failed")
+            else:
+                logger.info(f"Circuit for {self.name} closed after a successful probe")
+                self.state = "closed"
+                self._outcomes.clear()
+            return
+
+        self._outcomes.append((now, status))
+        self._trim(now)
+        if self.state == "closed" and len(self._outcomes) >= BREAKER_MIN_REQUESTS:
+            failures = sum(1 for _, outcome in self._outcomes if outcome in self.FAILURES)
+            if failures / len(self._outcomes) >= BREAKER_FAILURE_RATE:
+                self._open(now, f"{failures}/{len(self._outcomes)} recent scrapes failed")
+
+    def release(self):
+        """Let another probe through if the one allowed never recorded an outcome."""
+        if self.state == "half_open":
+            self.probe_in_flight = False
+
+    def _open(self, now: float, reason: str):
+        logger.warning(f"Circuit for {self.name} opened: {reason}")
+        self.state = "open"
+        self.opened_at = now
+
+    def status(self) -> Dict:
+        now = time.time()
+        self._trim(now)
+        samples = len(self._outcomes)
+
+        def count(*statuses):
+            return sum(1 for _, outcome in self._outcomes if outcome in statuses)
+
+        return {
+            "state": self.state,
+            "samples": samples,
+            "failure_rate": round(count(*self.FAILURES) / samples, 3) if samples else 0.0,
+            "timeout_rate": round(count("timeout") / samples, 3) if samples else 0.0,
+            "parse_error_rate": round(count("parse_error") / samples, 3) if samples else 0.0,
+            "short_circuited": self.short_circuited,
+            "retry_in": round(max(0.0, self.opened_at + BREAKER_COOLDOWN - now), 1) if self.state == "open" else 0.0,
+        }
+
+# Keyed by scraper function name, one breaker per platform scraper
+circuit_breakers = {}
+
+def breaker_for(platform: str) -> CircuitBreaker:
+    name = SCRAPERS[platform].__name__
+    breaker = circuit_breakers.get(name)
+    if breaker is None:
+        breaker = circuit_breakers[name] = CircuitBreaker(name)
+    return breaker
+
+class AdmissionRejected(Exception):
+    def __init__(self, reason: str, retry_after: int):
+        super().__init__(f"Scrape capacity exhausted ({reason})")
+        self.reason = reason
+        self.retry_after = retry_after
+
+class AdmissionController:
+    """Caps concurrent scrapes and bounds how many may queue, and for how long."""
+
+    def __init__(self, max_active: int, max_queue: int, max_wait: float):
+        self.max_active = max_active
+        self.max_queue = max_queue
+        self.max_wait = max_wait
+        self.active = 0
+        self.waiting = 0
+        self.rejected = Counter()
+        self._semaphore = None
+        self._loop = None
+        self._avg_hold = 5.0
+
+    def _get_semaphore(self) -> asyncio.Semaphore:
+        # Semaphores belong to one event loop, so create ours on first use in this loop
+        loop = asyncio.get_running_loop()
+        if self._semaphore is None or self._loop is not loop:
+            self._semaphore = asyncio.Semaphore(self.max_active)
+            self._loop = loop
+        return self._semaphore
+
+    def retry_after(self) -> int:
+        # Rough time for the current backlog to drain
+        backlog = self.waiting + self.active
+        return max(1, math.ceil(self._avg_hold * backlog / max(1, self.max_active)))
+
+    def _reject(self, reason: str):
+        self.rejected[reason] += 1
+        metrics.inc("admission_rejections_total", {"reason": reason})
+        raise AdmissionRejected(reason, self.retry_after())
+
+    @asynccontextmanager
+    async def slot(self, bypass_queue: bool = False):
+        semaphore = self._get_semaphore()
+        if bypass_queue:
+            # Count it, but don't wait behind queued work
             pass
-    return {"platform": "Meesho", "price": 0, "link": ""}
+        elif semaphore.locked():
+            if self.waiting >= self.max_queue:
+                self._reject("queue_full")
+            self.waiting += 1
+            start = time.monotonic()
+            try:
+                await asyncio.wait_for(semaphore.acquire(), timeout=self.max_wait)
+            except asyncio.TimeoutError:
+                self._reject("queue_timeout")
+            finally:
+                self.waiting -= 1
+                metrics.observe("admission_wait_seconds", time.monotonic() - start)
+        else:
+            await semaphore.acquire()
+
+        self.active += 1
+        start = time.monotonic()
+        try:
+            yield
+        finally:
+            self.active -= 1
+            self._avg_hold = 0.8 * self._avg_hold + 0.2 * (time.monotonic() - start)
+            if not bypass_queue:
+                semaphore.release()
+
+    def stats(self) -> Dict:
+        return {
+            "active": self.active,
+            "waiting": self.waiting,
+            "max_active": self.max_active,
+            "max_queue": self.max_queue,
+            "rejected": dict(self.rejected),
+        }
+
+admission = AdmissionController(ADMISSION_MAX_ACTIVE, ADMISSION_QUEUE_SIZE, ADMISSION_MAX_WAIT)
+
+result_cache = ResultCache(CACHE_MAX_SIZE, CACHE_STALE_TTL)
+scrape_flight = SingleFlight()
+background_tasks = set()
+
+def cache_result(key, platform: str, result: Dict):
+    # Remember failures and "not found" only briefly so a flaky page doesn't stick around
+    ttl = CACHE_TTLS[platform] if result.get("status") == "ok" else CACHE_NEGATIVE_TTL
+    if ttl > 0:
+        result_cache.set(key, result, ttl)
+
+async def scrape_and_cache(key, platform: str, product_name: str, top_n: int, bypass_queue: bool = False) -> Dict:
+    breaker = breaker_for(platform)
+    if not breaker.allow():
+        # Don't spend a full deadline on a platform that is currently failing
+        metrics.inc("scrape_results_total", {"platform": platform, "outcome": "degraded"})
+        return empty_result(platform, "degraded")
+
+    recorded = False
+    try:
+        async with admission.slot(bypass_queue):
+            try:
+                result = await run_scraper(SCRAPERS[platform], product_name, top_n)
+            except ScrapeJobTimeout:
+                result = empty_result(platform, "timeout")
+            except Exception:
+                recorded = True
+                breaker.record("error")
+                raise
+        recorded = True
+        breaker.record(result["status"])
+    finally:
+        # A half-open probe turned away by admission control or cancelled
+        # never tested the platform; don't leave the breaker waiting on it
+        if not recorded:
+            breaker.release()
+    result["observed_at"] = time.time()
+    if CACHE_ENABLED:
+        cache_result(key, platform, result)
+    if history_store is not None:
+        history_store.record(key[0], product_name, result)
+    return result
+
+async def scrape_shared(key, platform: str, product_name: str, top_n: int, bypass_queue: bool = False) -> Dict:
+    return await scrape_flight.do(key, scrape_and_cache, key, platform, product_name, top_n, bypass_queue)
+
+async def refresh_result(key, platform: str, product_name: str, top_n: int):
+    try:
+        await scrape_shared(key, platform, product_name, top_n)
+    except Exception as e:
+        logger.error(f"Background refresh failed for {platform} '{product_name}': {str(e)}")
+
+async def last_known_result(key, platform: str) -> Optional[Dict]:
+    """Best answer we have without scraping, however old."""
+    if not ADMISSION_SERVE_STALE:
+        return None
+    result = result_cache.peek(key)
+    if result is None or result["status"] != "ok":
+        # An old failure is no better than a busy answer
+        result = await recent_observation(key[0], platform, ADMISSION_STALE_MAX_AGE)
+    if result is not None:
+        result["stale"] = True
+    return result
+
+def busy_result(platform: str, rejection: AdmissionRejected) -> Dict:
+    result = empty_result(platform, "busy")
+    result["retry_after"] = rejection.retry_after
+    return result
+
+def error_result(platform: str, error: BaseException) -> Dict:
+    result = empty_result(platform, "error")
+    result["error"] = str(error)
+    return result
+
+async def get_platform_result(platform: str, product_name: str, top_n: int = DEFAULT_TOP_N,
+                              bypass_queue: bool = False) -> Dict:
+    key = (canonical_query(product_name), platform, top_n)
+    if CACHE_ENABLED:
+        cached = result_cache.get(key)
+        if cached is not None:
+            result, fresh = cached
+            if not fresh and not scrape_flight.in_flight(key):
+                # Serve the stale answer now and refresh it in the background
+                task = asyncio.create_task(refresh_result(key, platform, product_name, top_n))
+                background_tasks.add(task)
+                task.add_done_callback(background_tasks.discard)
+            return result
+
+    # A recent stored observation is good enough for the default view
+    if top_n == DEFAULT_TOP_N:
+        result = await recent_observation(key[0], platform)
+        if result is not None:
+            return result
+
+    # Identical concurrent requests wait on the same scrape
+    try:
+        return await scrape_shared(key, platform, product_name, top_n, bypass_queue)
+    except AdmissionRejected:
+        result = await last_known_result(key, platform)
+        if result is None:
+            raise
+        return result
+
+class TokenBucket:
+    """Allows `rate_per_minute` events per minute with bursts up to `capacity`."""
+
+    def __init__(self, rate_per_minute: float, capacity: float = None):
+        self.rate = rate_per_minute / 60
+        self.capacity = capacity if capacity is not None else max(1.0, rate_per_minute / 6)
+        self.tokens = self.capacity
+        self.updated = time.monotonic()
+
+    def take(self) -> bool:
+        now = time.monotonic()
+        self.tokens = min(self.capacity, self.tokens + (now - self.updated) * self.rate)
+        self.updated = now
+        if self.tokens >= 1:
+            self.tokens -= 1
+            return True
+        return False
+
+class WatchEntry:
+    def __init__(self, query: str, source: str):
+        self.query = query
+        self.source = source
+        self.added_at = time.time()
+        # Due right away so a new entry is warmed on the next tick (unless already cached)
+        self.next_due = {platform: 0.0 for platform in PLATFORMS}
+        self.last_refreshed = {}
+
+class RefreshScheduler:
+    """Keeps watched and frequently requested queries fresh in the cache and history."""
+
+    def __init__(self):
+        self.entries = {}
+        self.request_counts = Counter()
+        self.query_text = {}
+        self.budgets = {platform: TokenBucket(rate) for platform, rate in REFRESH_BUDGETS.items()}
+        self.refreshes = Counter()
+        self.deferred = Counter()
+        self._last_decay = time.monotonic()
+        self._task = None
+
+    def note_request(self, product_name: str):
+        key = canonical_query(product_name)
+        self.request_counts[key] += 1
+        # Remember a natural word order to search with if the query turns popular
+        self.query_text[key] = clean_query(product_name)
+
+    def register(self, product_name: str, source: str = "manual") -> bool:
+        key = canonical_query(product_name)
+        entry = self.entries.get(key)
+        if entry is not None:
+            # An explicit registration pins a query that was only tracked for popularity
+            if source == "manual":
+                entry.source = "manual"
+            return True
+        if len(self.entries) >= WATCHLIST_MAX_SIZE:
+            return False
+        self.entries[key] = WatchEntry(clean_query(product_name), source)
+        return True
+
+    def unregister(self, product_name: str) -> bool:
+        return self.entries.pop(canonical_query(product_name), None) is not None
+
+    def snapshot(self) -> List[Dict]:
+        return [
+            {
+                "query": entry.query,
+                "source": entry.source,
+                "added_at": entry.added_at,
+                "last_refreshed": dict(entry.last_refreshed),
+                "next_due": dict(entry.next_due),
+                "requests": self.request_counts.get(key, 0),
+            }
+            for key, entry in self.entries.items()
+        ]
+
+    def _track_popular(self):
+        if time.monotonic() - self._last_decay >= POPULAR_DECAY_INTERVAL:
+            # Halve old counts so yesterday's trend fades out
+            self.request_counts = Counter({
+                key: count // 2 for key, count in self.request_counts.items() if count // 2 > 0
+            })
+            self.query_text = {key: text for key, text in self.query_text.items() if key in self.request_counts}
+            self._last_decay = time.monotonic()
+
+        popular = {
+            key for key, count in self.request_counts.most_common(POPULAR_TRACK_COUNT)
+            if count >= POPULAR_MIN_REQUESTS
+        }
+        for key in popular:
+            self.register(self.query_text.get(key, key), source="popular")
+        for key in [key for key, entry in self.entries.items() if entry.source == "popular" and key not in popular]:
+            del self.entries[key]
+
+    def _schedule_refreshes(self):
+        now = time.time()
+        # Most overdue first, so a tight budget still gets round to everything
+        due = sorted(
+            (entry.next_due[platform], key, platform)
+            for key, entry in self.entries.items()
+            for platform in PLATFORMS
+            if entry.next_due[platform] <= now
+        )
+        for _, key, platform in due:
+            entry = self.entries[key]
+            cache_key = (key, platform, DEFAULT_TOP_N)
+            if scrape_flight.in_flight(cache_key):
+                continue
+            interval = WATCH_REFRESH_INTERVALS[platform]
+            jitter = random.uniform(1 - WATCH_JITTER, 1 + WATCH_JITTER)
+            # Requests may have just scraped it (that's how popular queries get here);
+            # schedule from that scrape instead of spending budget on a duplicate
+            cached = result_cache.peek(cache_key)
+            observed_at = cached.get("observed_at") if cached is not None and cached["status"] == "ok" else None
+            if observed_at is not None and now - observed_at < interval:
+                entry.next_due[platform] = observed_at + interval * jitter
+                continue
+            if not self.budgets[platform].take():
+                self.deferred[platform] += 1
+                continue
+            entry.next_due[platform] = now + interval * jitter
+            entry.last_refreshed[platform] = now
+            self.refreshes[platform] += 1
+            task = asyncio.create_task(refresh_result(cache_key, platform, entry.query, DEFAULT_TOP_N))
+            background_tasks.add(task)
+            task.add_done_callback(background_tasks.discard)
+
+    async def run(self):
+        while True:
+            await asyncio.sleep(SCHEDULER_TICK)
+            try:
+                self._track_popular()
+                self._schedule_refreshes()
+            except Exception as e:
+                logger.error(f"Refresh scheduler error: {str(e)}")
+
+    def start(self):
+        if self._task is None:
+            self._task = asyncio.create_task(self.run())
+
+    def stop(self):
+        if self._task is not None:
+            self._task.cancel()
+            self._task = None
+
+refresh_scheduler = RefreshScheduler()
+
+@startup_stage("refresh_scheduler")
+async def start_refresh_scheduler():
+    if SCHEDULER_ENABLED:
+        refresh_scheduler.start()
+
+@shutdown_stage
+async def stop_refresh_scheduler():
+    refresh_scheduler.stop()
+
+def validate_compare_params(product_name: str, top: int):
+    if not product_name or not canonical_query(product_name):
+        raise HTTPException(status_code=400, detail="Product name cannot be empty")
+    if not 1 <= top <= MAX_TOP_N:
+        raise HTTPException(status_code=400, detail=f"top must be between 1 and {MAX_TOP_N}")
+
+def present_result(result: Dict, candidates: bool) -> Dict:
+    if not candidates:
+        result.pop("candidates", None)
+    return result
+
+# Fields that change on every scrape without the prices changing
+ETAG_IGNORED_FIELDS = ("observed_at", "stale", "retry_after")
+
+def results_etag(results: List[Dict]) -> str:
+    content = [{key: value for key, value in result.items() if key not in ETAG_IGNORED_FIELDS} for result in results]
+    digest = hashlib.sha256(json.dumps(content, sort_keys=True, separators=(",", ":")).encode("utf-8")).hexdigest()
+    # Weak, because the same results may be sent gzip- or brotli-encoded
+    return f'W/"{digest[:32]}"'
+
+def etag_matches(if_none_match: Optional[str], etag: str) -> bool:
+    if not if_none_match:
+        return False
+    tags = {tag.strip().replace("W/", "", 1) for tag in if_none_match.split(",")}
+    return "*" in tags or etag.replace("W/", "", 1) in tags
+
+def freshness_headers(results: List[Dict]) -> Dict:
+    """ETag, Last-Modified and a max-age matching the least fresh platform result."""
+    now = time.time()
+    observed = [result.get("observed_at") or now for result in results]
+    max_age = 0
+    if CACHE_ENABLED and all(result["status"] in ("ok", "empty") and not result.get("stale") for result in results):
+        max_age = min(
+            (CACHE_TTLS[result["platform"]] if result["status"] == "ok" else CACHE_NEGATIVE_TTL) - (now - seen)
+            for result, seen in zip(results, observed)
+        )
+    return {
+        "ETag": results_etag(results),
+        "Last-Modified": formatdate(max(observed), usegmt=True),
+        "Cache-Control": f"public, max-age={max(0, int(max_age))}",
+    }
+
+def cached_compare_results(product_name: str, top: int, candidates: bool) -> Optional[List[Dict]]:
+    """Every platform's fresh cached result, or None if any would need a scrape."""
+    results = []
+    for platform in SCRAPERS:
+        cached = result_cache.get((canonical_query(product_name), platform, top))
+        if cached is None or not cached[1]:
+            return None
+        results.append(present_result(cached[0], candidates))
+    return results
 
 @app.get("/compare/{product_name}", tags=["Price Comparison"])
-async def compare_prices(product_name: str) -> List[Dict]:
+async def compare_prices(product_name: str, top: int = DEFAULT_TOP_N, candidates: bool = False,
+                         request: Request = None, response: Response = None) -> List[Dict]:
+    """Best listing per platform among the top N; candidates=true also returns all N."""
     logger.info(f"Compare endpoint accessed for product: {product_name}")
     try:
-        if not product_name or len(product_name.strip()) == 0:
-            raise HTTPException(status_code=400, detail="Product name cannot be empty")
-            
+        validate_compare_params(product_name, top)
+        refresh_scheduler.note_request(product_name)
+        if_none_match = request.headers.get("if-none-match") if request is not None else None
+
+        # A client revalidating results we still hold fresh gets a 304 without any scraping
+        if if_none_match and CACHE_ENABLED:
+            cached = cached_compare_results(product_name, top, candidates)
+            if cached is not None:
+                headers = freshness_headers(cached)
+                if etag_matches(if_none_match, headers["ETag"]):
+                    return Response(status_code=304, headers=headers)
+
+        # Scrape all platforms in parallel; results keep the platform order
+        outcomes = await asyncio.gather(
+            *(get_platform_result(platform, product_name, top) for platform in SCRAPERS),
+            return_exceptions=True,
+        )
+        # Only refuse the whole request when no platform could be served
+        rejected = [outcome for outcome in outcomes if isinstance(outcome, AdmissionRejected)]
+        if len(rejected) == len(outcomes):
+            raise rejected[0]
+        # A platform that failed gets an error entry; the others' results still count
         results = []
-        
-        # Scrape from all platforms
-        amazon_result = scrape_amazon(product_name)
-        time.sleep(2)  # Add delay between requests
-        flipkart_result = scrape_flipkart(product_name)
-        time.sleep(2)  # Add delay between requests
-        meesho_result = scrape_meesho(product_name)
-        
-        results.extend([amazon_result, flipkart_result, meesho_result])
+        for platform, outcome in zip(SCRAPERS, outcomes):
+            if isinstance(outcome, AdmissionRejected):
+                outcome = busy_result(platform, outcome)
+            elif isinstance(outcome, Exception):
+                logger.error(f"Error getting {platform} result: {str(outcome)}")
+                outcome = error_result(platform, outcome)
+            results.append(present_result(outcome, candidates))
         logger.info(f"Results: {json.dumps(results, indent=2)}")
+        if response is not None:
+            headers = freshness_headers(results)
+            if etag_matches(if_none_match, headers["ETag"]):
+                return Response(status_code=304, headers=headers)
+            response.headers.update(headers)
         return results
+    except HTTPException:
+        raise
+    except AdmissionRejected as e:
+        logger.warning(f"Rejected compare for {product_name}: {e.reason}")
+        raise HTTPException(
+            status_code=503,
+            detail="Too many searches in progress, please retry shortly",
+            headers={"Retry-After": str(e.retry_after)},
+        )
     except Exception as e:
         logger.error(f"Error in compare_prices: {str(e)}")
         raise HTTPException(status_code=500, detail=str(e))
 
+async def get_platform_result_safe(platform: str, product_name: str, top_n: int = DEFAULT_TOP_N,
+                                   bypass_queue: bool = False) -> Dict:
+    try:
+        return await get_platform_result(platform, product_name, top_n, bypass_queue)
+    except AdmissionRejected as e:
+        return busy_result(platform, e)
+    except Exception as e:
+        logger.error(f"Error getting {platform} result: {str(e)}")
+        return error_result(platform, e)
+
+@app.get("/compare/{product_name}/stream", tags=["Price Comparison"])
+async def compare_prices_stream(product_name: str, format: str = "ndjson", top: int = DEFAULT_TOP_N,
+                                candidates: bool = False):
+    """Stream each platform's result as soon as it is ready (NDJSON or SSE)."""
+    logger.info(f"Compare stream accessed for product: {product_name}")
+    validate_compare_params(product_name, top)
+    refresh_scheduler.note_request(product_name)
+    if format not in ("ndjson", "sse"):
+        raise HTTPException(status_code=400, detail="format must be 'ndjson' or 'sse'")
+
+    async def events():
+        tasks = [
+            asyncio.ensure_future(get_platform_result_safe(platform, product_name, top, ADMISSION_STREAM_BYPASS))
+            for platform in SCRAPERS
+        ]
+        try:
+            for next_result in asyncio.as_completed(tasks):
+                result = present_result(await next_result, candidates)
+                if format == "sse":
+                    yield f"event: result\ndata: {json.dumps(result)}\n\n"
+                else:
+                    yield json.dumps(result) + "\n"
+            if format == "sse":
+                yield "event: done\ndata: {}\n\n"
+        finally:
+            # The client went away; stop waiting (shared scrapes keep running)
+            for task in tasks:
+                task.cancel()
+
+    media_type = "text/event-stream" if format == "sse" else "application/x-ndjson"
+    return StreamingResponse(
+        events(),
+        media_type=media_type,
+        headers={"Cache-Control": "no-cache", "X-Accel-Buffering": "no"},
+    )
+
+class BatchCompareRequest(BaseModel):
+    queries: List[str]
+    top: int = DEFAULT_TOP_N
+    candidates: bool = False
+    platforms: Optional[List[str]] = None
+    concurrency: Optional[int] = Field(None, ge=1)
+
+@app.post("/compare/batch", tags=["Price Comparison"])
+async def compare_batch(batch: BatchCompareRequest):
+    """Compare many queries at once, streaming one NDJSON line per (query, platform)."""
+    if not batch.queries:
+        raise HTTPException(status_code=400, detail="queries cannot be empty")
+    if len(batch.queries) > BATCH_MAX_QUERIES:
+        raise HTTPException(status_code=400, detail=f"At most {BATCH_MAX_QUERIES} queries per batch")
+    for query in batch.queries:
+        validate_compare_params(query, batch.top)
+    platforms = list(dict.fromkeys(batch.platforms or SCRAPERS))
+    unknown = [platform for platform in platforms if platform not in SCRAPERS]
+    if unknown:
+        raise HTTPException(status_code=400, detail=f"Unknown platform: {unknown[0]}")
+    logger.info(f"Batch compare accessed for {len(batch.queries)} queries")
+
+    # One queue of queries per platform, duplicates dropped
+    queries = list({canonical_query(query): query for query in reversed(batch.queries)}.values())[::-1]
+    jobs = {platform: deque(queries) for platform in platforms}
+    total = len(queries) * len(platforms)
+    concurrency = min(batch.concurrency or BATCH_CONCURRENCY, BATCH_CONCURRENCY)
+    # Every platform gets workers draining its queue in order; the budget caps how
+    # many of them scrape at once across the whole batch
+    workers_per_platform = max(1, math.ceil(concurrency / len(platforms)))
+
+    async def events():
+        done = asyncio.Queue()
+        budget = asyncio.Semaphore(concurrency)
+
+        async def platform_worker(platform: str):
+            while jobs[platform]:
+                query = jobs[platform].popleft()
+                try:
+                    async with budget:
+                        result = await get_platform_result(platform, query, batch.top)
+                except AdmissionRejected as e:
+                    result = busy_result(platform, e)
+                except Exception as e:
+                    logger.error(f"Batch job failed for {platform} '{query}': {str(e)}")
+                    result = error_result(platform, e)
+                await done.put({"query": query, **present_result(result, batch.candidates)})
+
+        workers = [
+            asyncio.ensure_future(platform_worker(platform))
+            for platform in platforms
+            for _ in range(workers_per_platform)
+        ]
+        statuses = Counter()
+        try:
+            for _ in range(total):
+                line = await done.get()
+                statuses[line["status"]] += 1
+                yield json.dumps(line) + "\n"
+            yield json.dumps({"done": True, "jobs": total, "statuses": dict(statuses)}) + "\n"
+        finally:
+            # The client went away; stop taking new jobs (shared scrapes keep running)
+            for worker in workers:
+                worker.cancel()
+
+    return StreamingResponse(
+        events(),
+        media_type="application/x-ndjson",
+        headers={"Cache-Control": "no-cache", "X-Accel-Buffering": "no"},
+    )
+
+@app.get("/history/{product_name}", tags=["Price History"])
+async def price_history(product_name: str, hours: float = 24, platform: str = None, limit: int = 100) -> List[Dict]:
+    """Stored observations for a product, newest first."""
+    if history_store is None:
+        raise HTTPException(status_code=404, detail="Price history is disabled")
+    if platform is not None and platform not in PLATFORMS:
+        raise HTTPException(status_code=400, detail=f"Unknown platform: {platform}")
+    since = time.time() - hours * 3600
+    # SQLite reads a negative LIMIT as no limit at all
+    limit = max(1, min(limit, 1000))
+    return await run_blocking(history_store.history, canonical_query(product_name), since, platform, limit)
+
+@app.get("/history/{product_name}/stats", tags=["Price History"])
+async def price_history_stats(product_name: str, hours: float = 24 * 7) -> List[Dict]:
+    """Min, max and average price per platform over the window."""
+    if history_store is None:
+        raise HTTPException(status_code=404, detail="Price history is disabled")
+    since = time.time() - hours * 3600
+    return await run_blocking(history_store.summary, canonical_query(product_name), since)
+
+@app.get("/watchlist", tags=["Watchlist"])
+async def get_watchlist() -> Dict:
+    return {
+        "entries": refresh_scheduler.snapshot(),
+        "refreshes": dict(refresh_scheduler.refreshes),
+        "deferred_by_budget": dict(refresh_scheduler.deferred),
+    }
+
+@app.post("/watchlist/{product_name}", tags=["Watchlist"])
+async def add_to_watchlist(product_name: str) -> Dict:
+    if not product_name or len(product_name.strip()) == 0:
+        raise HTTPException(status_code=400, detail="Product name cannot be empty")
+    if not refresh_scheduler.register(product_name):
+        raise HTTPException(status_code=409, detail=f"Watchlist is full ({WATCHLIST_MAX_SIZE} entries)")
+    return {"query": canonical_query(product_name), "watched": True}
+
+@app.delete("/watchlist/{product_name}", tags=["Watchlist"])
+async def remove_from_watchlist(product_name: str) -> Dict:
+    if not refresh_scheduler.unregister(product_name):
+        raise HTTPException(status_code=404, detail="Query is not on the watchlist")
+    return {"query": canonical_query(product_name), "watched": False}
+
+@app.get("/selectors", tags=["Monitoring"])
+async def selector_stats() -> Dict:
+    """Hit rate and lookup time of each platform's selectors, in the order they are tried."""
+    return selector_registry.stats()
+
+@app.get("/admission/stats", tags=["Monitoring"])
+async def admission_stats() -> Dict:
+    return admission.stats()
+
+@app.get("/platforms/status", tags=["Monitoring"])
+async def platform_status() -> Dict:
+    """Circuit breaker state and current wait deadline for each platform."""
+    return {
+        platform: {
+            **breaker_for(platform).status(),
+            "degraded": breaker_for(platform).state != "closed",
+            "deadline": round(scrape_deadlines[platform].current(), 2),
+        }
+        for platform in PLATFORMS
+    }
+
+@app.get("/cache/stats", tags=["Price Comparison"])
+async def cache_stats() -> Dict:
+    stats = result_cache.stats()
+    stats["coalesced"] = scrape_flight.coalesced
+    return stats
+
+@app.get("/healthz", tags=["Monitoring"])
+async def healthz() -> Dict:
+    """Liveness: the process is up and serving requests."""
+    return {"status": "ok", "uptime_seconds": round(time.time() - IMPORT_STARTED_AT, 1)}
+
+def startup_report() -> Dict:
+    report = {
+        "import_seconds": round(MODULE_IMPORT_SECONDS, 3),
+        "lazy_import_seconds": {name: round(seconds, 3) for name, seconds in lazy_import_seconds.items()},
+        "startup_stage_seconds": {name: round(seconds, 3) for name, seconds in startup_stage_seconds.items()},
+        "time_to_ready_seconds": (
+            round(readiness.ready_at - IMPORT_STARTED_AT, 3) if readiness.ready_at is not None else None
+        ),
+    }
+    if psutil is not None and readiness.ready_at is not None:
+        # Includes interpreter and uvicorn start-up, i.e. the whole cold start
+        report["process_start_to_ready_seconds"] = round(readiness.ready_at - psutil.Process().create_time(), 3)
+    return report
+
+@app.get("/readyz", tags=["Monitoring"])
+async def readyz():
+    """Readiness: startup has finished and warm scrape capacity exists."""
+    body = {
+        "ready": readiness.is_ready(),
+        "started": readiness.started,
+        "warm": readiness.warm,
+        "error": readiness.warm_error,
+        "drivers": driver_pool.stats()["live"],
+        **startup_report(),
+    }
+    if scrape_processes is not None:
+        body["warm_workers"] = readiness.warm_workers
+    return JSONResponse(status_code=200 if body["ready"] else 503, content=body)
+
+@app.get("/metrics", tags=["Monitoring"])
+async def prometheus_metrics():
+    pool = driver_pool.stats()
+    for state in ("live", "idle", "in_use"):
+        metrics.set_gauge("driver_pool_drivers", pool[state], {"state": state})
+    if psutil is not None:
+        chrome = await run_blocking(chrome_process_stats)
+        metrics.set_gauge("chrome_sessions", chrome["sessions"])
+        metrics.set_gauge("chrome_processes", chrome["processes"])
+        metrics.set_gauge("chrome_memory_bytes", chrome["rss_bytes"])
+    cache = result_cache.stats()
+    metrics.set_gauge("result_cache_entries", cache["size"])
+    for result, field in (("hit", "hits"), ("stale_hit", "stale_hits"), ("miss", "misses")):
+        metrics.set_gauge("result_cache_lookups_total", cache[field], {"result": result})
+    metrics.set_gauge("singleflight_coalesced_total", scrape_flight.coalesced)
+    metrics.set_gauge("admission_active", admission.active)
+    metrics.set_gauge("admission_queue_depth", admission.waiting)
+    if scrape_processes is not None:
+        workers = scrape_processes.stats()
+        metrics.set_gauge("scrape_worker_processes", workers["workers"] if workers["started"] else 0)
+        metrics.set_gauge("scrape_worker_restarts_total", workers["restarts"])
+    for platform in PLATFORMS:
+        breaker = breaker_for(platform)
+        for state in ("closed", "open", "half_open"):
+            metrics.set_gauge("circuit_breaker_state", 1 if breaker.state == state else 0, {"platform": platform, "state": state})
+        metrics.set_gauge("scrape_deadline_seconds", scrape_deadlines[platform].current(), {"platform": platform})
+    report = startup_report()
+    metrics.set_gauge("app_import_seconds", report["import_seconds"])
+    if report["time_to_ready_seconds"] is not None:
+        metrics.set_gauge("app_time_to_ready_seconds", report["time_to_ready_seconds"])
+    for stage, seconds in report["startup_stage_seconds"].items():
+        metrics.set_gauge("app_startup_stage_seconds", seconds, {"stage": stage})
+    for module, seconds in report["lazy_import_seconds"].items():
+        metrics.set_gauge("app_lazy_import_seconds", seconds, {"module": module})
+    metrics.set_gauge("app_ready", 1 if readiness.is_ready() else 0)
+    return PlainTextResponse(metrics.render(), media_type="text/plain; version=0.0.4")
+
+MODULE_IMPORT_SECONDS = time.time() - IMPORT_STARTED_AT
+
 if __name__ == "__main__":
     import uvicorn
     logger.info("Starting the application...")
@@ -0,0 +1,200 @@
+"""Offline benchmark for compare_prices.
+
+Serves saved search-result pages for Amazon, Flipkart and Meesho from a local
+HTTP server, points the scrapers at it through SEARCH_URL_<PLATFORM> and
+measures compare_prices latency and throughput at several concurrency levels.
+
+    python bench/benchmark.py --concurrency 1,4,16 --requests 60 --latency 150
+
+With --js-render the pages are built client-side after --render-delay ms, so
+the HTTP tier finds nothing and every scrape goes through Selenium (needs Chrome).
+"""
+import argparse
+import asyncio
+import importlib
+import json
+import logging
+import math
+import os
+import random
+import statistics
+import sys
+import threading
+import time
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+DEFAULT_FIXTURES = os.path.join(ROOT, "bench", "fixtures")
+
+# Path on the fixture server and fixture file for each platform
+ROUTES = {
+    "Amazon": ("/amazon/s", "amazon.html", "k"),
+    "Flipkart": ("/flipkart/search", "flipkart.html", "q"),
+    "Meesho": ("/meesho/search", "meesho.html", "q"),
+}
+
+JS_SHELL = """<!DOCTYPE html>
+<html><head><meta charset="utf-8"></head>
+<body><div id="root">Loading...</div>
+<script>
+setTimeout(function () {{
+    document.open();
+    document.write({page});
+    document.close();
+}}, {delay});
+</script>
+</body></html>
+"""
+
+class FixtureHandler(BaseHTTPRequestHandler):
+    pages = {}
+    latency = 0.0
+    jitter = 0.0
+    js_render = False
+    render_delay = 0
+
+    def do_GET(self):
+        path = self.path.split("?", 1)[0]
+        page = self.pages.get(path)
+        if page is None:
+            self.send_error(404)
+            return
+
+        delay = self.latency + random.uniform(0, self.jitter)
+        if delay > 0:
+            time.sleep(delay)
+        if self.js_render:
+            # Escape "</" so the page's own </script> tags don't end the shell's script
+            page = JS_SHELL.format(page=json.dumps(page).replace("</", "<\\/"), delay=self.render_delay)
+
+        body = page.encode("utf-8")
+        self.send_response(200)
+        self.send_header("Content-Type", "text/html; charset=utf-8")
+        self.send_header("Content-Length", str(len(body)))
+        self.end_headers()
+        self.wfile.write(body)
+
+    def log_message(self, format, *args):
+        pass
+
+def start_fixture_server(args) -> ThreadingHTTPServer:
+    pages = {}
+    for path, filename, _ in ROUTES.values():
+        with open(os.path.join(args.fixtures, filename), encoding="utf-8") as f:
+            pages[path] = f.read()
+
+    FixtureHandler.pages = pages
+    FixtureHandler.latency = args.latency / 1000
+    FixtureHandler.jitter = args.jitter / 1000
+    FixtureHandler.js_render = args.js_render
+    FixtureHandler.render_delay = args.render_delay
+
+    server = ThreadingHTTPServer(("127.0.0.1", args.port), FixtureHandler)
+    server.daemon_threads = True
+    threading.Thread(target=server.serve_forever, daemon=True).start()
+    return server
+
+def load_app(server_port: int, args):
+    """Import 1.py with its search URLs pointed at the fixture server."""
+    for platform, (path, _, param) in ROUTES.items():
+        os.environ[f"SEARCH_URL_{platform.upper()}"] = f"http://127.0.0.1:{server_port}{path}?{param}={{query}}"
+    # Every request should scrape, so the cache, price history and prewarm are off unless asked for
+    os.environ.setdefault("CACHE_ENABLED", "1" if args.cache else "0")
+    os.environ.setdefault("DRIVER_POOL_PREWARM", "0")
+    os.environ.setdefault("HISTORY_DB_PATH", "")
+    # Measure queueing rather than rejections at high concurrency
+    os.environ.setdefault("ADMISSION_QUEUE_SIZE", "10000")
+    os.environ.setdefault("ADMISSION_MAX_WAIT", "300")
+    if args.fetch_mode:
+        os.environ["FETCH_MODE"] = args.fetch_mode
+
+    sys.path.insert(0, ROOT)
+    return importlib.import_module("1")
+
+def percentile(samples, pct: float) -> float:
+    ordered = sorted(samples)
+    if not ordered:
+        return 0.0
+    # Nearest-rank percentile
+    rank = max(1, math.ceil(pct / 100 * len(ordered)))
+    return ordered[rank - 1]
+
+async def run_level(app_module, concurrency: int, total: int, query: str) -> dict:
+    semaphore = asyncio.Semaphore(concurrency)
+    latencies = []
+    failures = 0
+
+    async def one(i: int):
+        nonlocal failures
+        async with semaphore:
+            # A distinct query per request so single-flight doesn't merge them
+            start = time.perf_counter()
+            results = await app_module.compare_prices(f"{query} {i}")
+            latencies.append(time.perf_counter() - start)
+            failures += sum(1 for result in results if result.get("status") != "ok")
+
+    start = time.perf_counter()
+    await asyncio.gather(*(one(i) for i in range(total)))
+    elapsed = time.perf_counter() - start
+    return {
+        "concurrency": concurrency,
+        "requests": total,
+        "failed_platform_results": failures,
+        "p50_ms": round(percentile(latencies, 50) * 1000, 1),
+        "p95_ms": round(percentile(latencies, 95) * 1000, 1),
+        "p99_ms": round(percentile(latencies, 99) * 1000, 1),
+        "mean_ms": round(statistics.mean(latencies) * 1000, 1),
+        "throughput_rps": round(total / elapsed, 2),
+    }
+
+def print_table(rows):
+    columns = ["concurrency", "requests", "failed_platform_results", "p50_ms", "p95_ms", "p99_ms", "mean_ms", "throughput_rps"]
+    widths = [max(len(column), *(len(str(row[column])) for row in rows)) for column in columns]
+    print("  ".join(column.rjust(width) for column, width in zip(columns, widths)))
+    for row in rows:
+        print("  ".join(str(row[column]).rjust(width) for column, width in zip(columns, widths)))
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--concurrency", default="1,4,16", help="comma-separated concurrency levels")
+    parser.add_argument("--requests", type=int, default=30, help="compare requests per level")
+    parser.add_argument("--query", default="iphone 15")
+    parser.add_argument("--fixtures", default=DEFAULT_FIXTURES, help="directory with amazon.html, flipkart.html, meesho.html")
+    parser.add_argument("--port", type=int, default=0, help="fixture server port (default: any free port)")
+    parser.add_argument("--latency", type=float, default=0, help="added server latency in ms")
+    parser.add_argument("--jitter", type=float, default=0, help="extra random latency in ms, up to this value")
+    parser.add_argument("--js-render", action="store_true", help="render listings client-side (forces Selenium)")
+    parser.add_argument("--render-delay", type=int, default=500, help="client-side render delay in ms")
+    parser.add_argument("--fetch-mode", choices=["auto", "http", "selenium"], help="override FETCH_MODE")
+    parser.add_argument("--cache", action="store_true", help="leave the result cache enabled")
+    parser.add_argument("--json", help="also write the results to this file")
+    parser.add_argument("--verbose", action="store_true", help="keep the app's INFO logging")
+    args = parser.parse_args()
+
+    server = start_fixture_server(args)
+    port = server.server_address[1]
+    app_module = load_app(port, args)
+    # The server does this in the background at startup; keep it out of the first request here too
+    app_module.preload_modules()
+    if not args.verbose:
+        logging.getLogger().setLevel(logging.WARNING)
+        app_module.logger.setLevel(logging.WARNING)
+
+    print(f"Fixture server on http://127.0.0.1:{port} (latency {args.latency}ms, "
+          f"js-render {'on' if args.js_render else 'off'}, fetch mode {app_module.FETCH_MODE})")
+
+    rows = []
+    try:
+        for level in [int(value) for value in args.concurrency.split(",") if value.strip()]:
+            rows.append(asyncio.run(run_level(app_module, level, args.requests, args.query)))
+    finally:
+        app_module.driver_pool.close()
+        server.shutdown()
+
+    print_table(rows)
+    if args.json:
+        with open(args.json, "w") as f:
+            json.dump(rows, f, indent=2)
+
+if __name__ == "__main__":
+    main()
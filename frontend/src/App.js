@@ -13,11 +13,32 @@ function App() {
     e.preventDefault();
     setLoading(true);
     setError('');
+    setResults([]);
     
     try {
-      const response = await fetch(`${API_URL}/compare/${encodeURIComponent(productName)}`);
-      const data = await response.json();
-      setResults(data);
+      // Each platform's result arrives as its own JSON line as soon as it is ready
+      const response = await fetch(`${API_URL}/compare/${encodeURIComponent(productName)}/stream`);
+      if (!response.ok) {
+        throw new Error(`Request failed with status ${response.status}`);
+      }
+      const reader = response.body.getReader();
+      const decoder = new TextDecoder();
+      let buffer = '';
+
+      while (true) {
+        const { value, done } = await reader.read();
+        if (done) break;
+        buffer += decoder.decode(value, { stream: true });
+        const lines = buffer.split('\n');
+        buffer = lines.pop();
+        const items = lines.filter(line => line.trim()).map(line => JSON.parse(line));
+        if (items.length) {
+          setResults(prev => [...prev, ...items]);
+        }
+      }
+      if (buffer.trim()) {
+        setResults(prev => [...prev, JSON.parse(buffer)]);
+      }
     } catch (err) {
       setError('Error fetching data. Please try again.');
       console.error(err);
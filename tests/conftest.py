@@ -0,0 +1,22 @@
+import importlib
+import os
+import sys
+
+import pytest
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, ROOT)
+
+
+@pytest.fixture(scope="session")
+def app_module(tmp_path_factory):
+    # No Chrome, database, scheduler or watchdog in tests
+    os.environ.update(
+        HISTORY_DB_PATH="",
+        SELECTOR_STATS_PATH=str(tmp_path_factory.mktemp("selectors") / "selector_stats.json"),
+        DRIVER_POOL_PREWARM="0",
+        DRIVER_WATCHDOG_INTERVAL="0",
+        SCHEDULER_ENABLED="0",
+        SCRAPE_BACKEND="thread",
+    )
+    return importlib.import_module("1")
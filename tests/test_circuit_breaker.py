@@ -0,0 +1,84 @@
+import asyncio
+from contextlib import asynccontextmanager
+
+import pytest
+
+
+@pytest.fixture
+def half_open_breaker(app_module, monkeypatch):
+    breaker = app_module.CircuitBreaker("test_platform")
+    breaker.state = "open"
+    breaker.opened_at = 0.0
+    monkeypatch.setattr(app_module, "breaker_for", lambda platform: breaker)
+    return breaker
+
+
+def scrape(app_module):
+    key = ("a b", "Amazon", app_module.DEFAULT_TOP_N)
+    return app_module.scrape_and_cache(key, "Amazon", "a b", app_module.DEFAULT_TOP_N)
+
+
+def test_rejected_probe_does_not_wedge_breaker(app_module, half_open_breaker, monkeypatch):
+    @asynccontextmanager
+    async def rejecting_slot(bypass_queue=False):
+        raise app_module.AdmissionRejected("queue_full", 1)
+        yield
+
+    monkeypatch.setattr(app_module.admission, "slot", rejecting_slot)
+    with pytest.raises(app_module.AdmissionRejected):
+        asyncio.run(scrape(app_module))
+    assert half_open_breaker.state == "half_open"
+    assert not half_open_breaker.probe_in_flight
+    assert half_open_breaker.allow()
+
+
+def test_cancelled_probe_does_not_wedge_breaker(app_module, half_open_breaker, monkeypatch):
+    async def hanging_scraper(scraper, product_name, top_n):
+        await asyncio.sleep(60)
+
+    monkeypatch.setattr(app_module, "run_scraper", hanging_scraper)
+
+    async def cancel_probe():
+        task = asyncio.ensure_future(scrape(app_module))
+        await asyncio.sleep(0.05)
+        task.cancel()
+        with pytest.raises(asyncio.CancelledError):
+            await task
+
+    asyncio.run(cancel_probe())
+    assert not half_open_breaker.probe_in_flight
+    assert half_open_breaker.allow()
+
+
+def test_probe_outcome_closes_breaker(app_module, half_open_breaker, monkeypatch):
+    async def ok_scraper(scraper, product_name, top_n):
+        return app_module.empty_result("Amazon", "ok")
+
+    monkeypatch.setattr(app_module, "run_scraper", ok_scraper)
+    monkeypatch.setattr(app_module, "CACHE_ENABLED", False)
+    assert asyncio.run(scrape(app_module))["status"] == "ok"
+    assert half_open_breaker.state == "closed"
+
+
+def listing(price):
+    return {"price": price, "mrp": 0, "link": "https://example.com/p", "title": "a b", "sponsored": False}
+
+
+def test_cards_without_prices_are_a_parse_error(app_module):
+    assert app_module.build_result("Amazon", "a b", [listing(0), listing(0)])["status"] == "parse_error"
+    assert app_module.build_result("Amazon", "a b", [])["status"] == "empty"
+    assert app_module.build_result("Amazon", "a b", [listing(1299)])["status"] == "ok"
+
+
+def test_searches_without_results_do_not_open_breaker(app_module):
+    breaker = app_module.CircuitBreaker("test_platform")
+    for _ in range(app_module.BREAKER_MIN_REQUESTS * 2):
+        breaker.record("empty")
+    assert breaker.state == "closed"
+
+
+def test_parse_errors_open_breaker(app_module):
+    breaker = app_module.CircuitBreaker("test_platform")
+    for _ in range(app_module.BREAKER_MIN_REQUESTS):
+        breaker.record("parse_error")
+    assert breaker.state == "open"
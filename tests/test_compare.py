@@ -0,0 +1,59 @@
+import asyncio
+from contextlib import asynccontextmanager
+
+import httpx
+import pytest
+
+
+@pytest.fixture
+def get(app_module, monkeypatch):
+    monkeypatch.setattr(app_module, "CACHE_ENABLED", False)
+
+    async def send(path):
+        transport = httpx.ASGITransport(app=app_module.app)
+        async with httpx.AsyncClient(transport=transport, base_url="http://test") as client:
+            return await asyncio.wait_for(client.get(path), 10)
+
+    return lambda path: asyncio.run(send(path))
+
+
+def ok_scraper(platform, app_module):
+    def compare_ok(product_name, top_n=5):
+        result = app_module.empty_result(platform, "ok")
+        result.update(price=100, title=product_name)
+        return result
+    return compare_ok
+
+
+def test_one_failing_platform_keeps_the_others(app_module, get, monkeypatch):
+    def compare_crash(product_name, top_n=5):
+        raise RuntimeError("scraper crashed")
+
+    platforms = list(app_module.SCRAPERS)
+    for platform in platforms:
+        monkeypatch.setitem(app_module.SCRAPERS, platform, ok_scraper(platform, app_module))
+    monkeypatch.setitem(app_module.SCRAPERS, platforms[0], compare_crash)
+
+    response = get("/compare/partial%20failure")
+    assert response.status_code == 200
+    results = response.json()
+    assert [result["platform"] for result in results] == platforms
+    assert results[0]["status"] == "error"
+    assert results[0]["error"] == "scraper crashed"
+    assert {result["status"] for result in results[1:]} == {"ok"}
+
+
+def test_all_platforms_rejected_is_a_503(app_module, get, monkeypatch):
+    @asynccontextmanager
+    async def rejecting_slot(bypass_queue=False):
+        raise app_module.AdmissionRejected("queue_full", 3)
+        yield
+
+    for platform in list(app_module.SCRAPERS):
+        monkeypatch.setitem(app_module.SCRAPERS, platform, ok_scraper(platform, app_module))
+    monkeypatch.setattr(app_module.admission, "slot", rejecting_slot)
+    monkeypatch.setattr(app_module, "ADMISSION_SERVE_STALE", False)
+
+    response = get("/compare/all%20rejected")
+    assert response.status_code == 503
+    assert response.headers["retry-after"] == "3"
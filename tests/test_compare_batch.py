@@ -0,0 +1,87 @@
+import asyncio
+import json
+import threading
+import time
+
+import httpx
+import pytest
+
+
+@pytest.fixture
+def post_batch(app_module, monkeypatch):
+    def fake_scraper(platform):
+        def scrape(product_name, top_n=5):
+            result = app_module.empty_result(platform, "ok")
+            result.update(price=100, title=product_name)
+            return result
+        return scrape
+
+    for platform in list(app_module.SCRAPERS):
+        monkeypatch.setitem(app_module.SCRAPERS, platform, fake_scraper(platform))
+    app_module.result_cache.clear()
+
+    async def send(payload, timeout):
+        # No lifespan: its shutdown would close the module's scrape executor
+        transport = httpx.ASGITransport(app=app_module.app)
+        async with httpx.AsyncClient(transport=transport, base_url="http://test") as client:
+            # A stream that never ends fails the test instead of hanging it
+            return await asyncio.wait_for(client.post("/compare/batch", json=payload), timeout)
+
+    def post(payload, timeout=10):
+        return asyncio.run(send(payload, timeout))
+    return post
+
+
+def ndjson(response):
+    assert response.status_code == 200
+    return [json.loads(line) for line in response.text.splitlines()]
+
+
+def test_batch_streams_one_line_per_query_and_platform(post_batch, app_module):
+    lines = ndjson(post_batch({"queries": ["a b", "c d"]}))
+    results, summary = lines[:-1], lines[-1]
+    assert len(results) == 2 * len(app_module.SCRAPERS)
+    assert summary == {"done": True, "jobs": len(results), "statuses": {"ok": len(results)}}
+
+
+def test_batch_drops_duplicate_queries(post_batch):
+    lines = ndjson(post_batch({"queries": ["a b", "B  a"], "platforms": ["Amazon"]}))
+    assert [(line["query"], line["status"]) for line in lines[:-1]] == [("a b", "ok")]
+    assert lines[-1]["jobs"] == 1
+
+
+def test_batch_duplicate_platforms_do_not_hang(post_batch):
+    lines = ndjson(post_batch({"queries": ["a b"], "platforms": ["Amazon", "Amazon"]}))
+    assert [(line["platform"], line["status"]) for line in lines[:-1]] == [("Amazon", "ok")]
+    assert lines[-1]["jobs"] == 1
+
+
+def test_batch_rejects_unknown_platform(post_batch):
+    assert post_batch({"queries": ["a"], "platforms": ["Ebay"]}).status_code == 400
+
+
+def test_batch_stays_within_its_concurrency(post_batch, app_module, monkeypatch):
+    running, peak = [0], [0]
+    lock = threading.Lock()
+
+    def slow_scraper(platform):
+        def scrape(product_name, top_n=5):
+            with lock:
+                running[0] += 1
+                peak[0] = max(peak[0], running[0])
+            time.sleep(0.05)
+            with lock:
+                running[0] -= 1
+            return app_module.empty_result(platform, "ok")
+        return scrape
+
+    for platform in list(app_module.SCRAPERS):
+        monkeypatch.setitem(app_module.SCRAPERS, platform, slow_scraper(platform))
+    lines = ndjson(post_batch({"queries": ["a", "b", "c"], "concurrency": 1}))
+    assert lines[-1]["statuses"] == {"ok": 3 * len(app_module.SCRAPERS)}
+    assert peak[0] == 1
+
+
+@pytest.mark.parametrize("concurrency", [-1, 0])
+def test_batch_rejects_concurrency_below_one(post_batch, concurrency):
+    assert post_batch({"queries": ["a"], "concurrency": concurrency}).status_code == 422
@@ -0,0 +1,25 @@
+import asyncio
+import json
+
+import httpx
+
+
+def test_stream_reports_scraper_errors_as_errors(app_module, monkeypatch):
+    def failing_scraper(product_name, top_n=5):
+        raise RuntimeError("scraper crashed")
+
+    for platform in list(app_module.SCRAPERS):
+        monkeypatch.setitem(app_module.SCRAPERS, platform, failing_scraper)
+    monkeypatch.setattr(app_module, "CACHE_ENABLED", False)
+
+    async def get_stream():
+        transport = httpx.ASGITransport(app=app_module.app)
+        async with httpx.AsyncClient(transport=transport, base_url="http://test") as client:
+            return await asyncio.wait_for(client.get("/compare/stream%20test/stream"), 10)
+
+    response = asyncio.run(get_stream())
+    assert response.status_code == 200
+    lines = [json.loads(line) for line in response.text.splitlines()]
+    assert len(lines) == len(app_module.SCRAPERS)
+    assert {line["status"] for line in lines} == {"error"}
+    assert {line["error"] for line in lines} == {"scraper crashed"}
@@ -0,0 +1,49 @@
+import os
+import shutil
+import subprocess
+import time
+
+import pytest
+
+psutil = pytest.importorskip("psutil")
+
+
+@pytest.fixture
+def spawn_chrome(tmp_path):
+    # A process named "chrome" that just sleeps
+    chrome = tmp_path / "chrome"
+    chrome.symlink_to(shutil.which("sleep"))
+    processes = []
+
+    def spawn(env):
+        process = subprocess.Popen([str(chrome), "60"], env=env)
+        processes.append(process)
+        return process
+
+    yield spawn
+    for process in processes:
+        process.kill()
+        process.wait()
+
+
+def test_reap_orphans_only_kills_our_chrome(app_module, spawn_chrome, monkeypatch):
+    monkeypatch.setattr(app_module, "DRIVER_ORPHAN_GRACE", 0)
+    foreign_env = {key: value for key, value in os.environ.items() if key != app_module.CHROME_OWNER_ENV}
+    ours = spawn_chrome({**os.environ, app_module.CHROME_OWNER_ENV: app_module.CHROME_OWNER})
+    foreign = spawn_chrome(foreign_env)
+    tagged_elsewhere = spawn_chrome({**foreign_env, app_module.CHROME_OWNER_ENV: "another-server"})
+    time.sleep(0.2)
+
+    assert app_module.reap_orphans(set()) == 1
+    assert ours.poll() is not None
+    assert foreign.poll() is None
+    assert tagged_elsewhere.poll() is None
+
+
+def test_reap_orphans_skips_pool_drivers(app_module, spawn_chrome, monkeypatch):
+    monkeypatch.setattr(app_module, "DRIVER_ORPHAN_GRACE", 0)
+    pooled = spawn_chrome({**os.environ, app_module.CHROME_OWNER_ENV: app_module.CHROME_OWNER})
+    time.sleep(0.2)
+
+    assert app_module.reap_orphans({pooled.pid}) == 0
+    assert pooled.poll() is None
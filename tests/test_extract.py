@@ -0,0 +1,56 @@
+import time
+
+import pytest
+
+NOT_LOADED = {"cards": None, "loaded": False, "no_results": False}
+LOADED_EMPTY = {"cards": None, "loaded": True, "no_results": False}
+NO_RESULTS = {"cards": None, "loaded": True, "no_results": True}
+CARD = {"price": "₹1,299", "mrp": "", "link": "https://example.com/p", "title": "a b", "sponsored": False, "hits": {}}
+
+
+class ScriptedDriver:
+    """Answers EXTRACT_SCRIPT with the last page whose start time has passed."""
+
+    def __init__(self, pages):
+        self.pages = pages
+        self.started = time.time()
+
+    def execute_script(self, script, spec):
+        elapsed = time.time() - self.started
+        return [page for at, page in self.pages if elapsed >= at][-1]
+
+
+@pytest.fixture
+def extract(app_module, monkeypatch):
+    monkeypatch.setattr(app_module, "SCRAPE_SETTLE_SECONDS", 0.3)
+    monkeypatch.setattr(app_module, "SCRAPE_POLL_INTERVAL", 0.02)
+    monkeypatch.setattr(app_module, "selector_registry", app_module.SelectorRegistry("", 3600))
+
+    def run(pages, budget=2.0):
+        start = time.time()
+        listings = app_module.extract_when_ready(ScriptedDriver(pages), "Amazon", 5, start, start + budget)
+        return listings, time.time() - start
+    return run
+
+
+def test_no_results_marker_returns_at_once(extract):
+    listings, elapsed = extract([(0, NOT_LOADED), (0.1, NO_RESULTS)])
+    assert listings == []
+    assert elapsed < 0.5
+
+
+def test_loaded_page_without_cards_settles_before_the_deadline(extract):
+    listings, elapsed = extract([(0, NOT_LOADED), (0.1, LOADED_EMPTY)])
+    assert listings == []
+    assert elapsed < 1.0
+
+
+def test_cards_rendered_after_load_are_still_read(extract):
+    listings, _ = extract([(0, LOADED_EMPTY), (0.1, {"cards": [CARD]})])
+    assert [listing["price"] for listing in listings] == [1299.0]
+
+
+def test_page_that_never_loads_times_out(extract):
+    listings, elapsed = extract([(0, NOT_LOADED)], budget=0.5)
+    assert listings is None
+    assert elapsed >= 0.5
@@ -0,0 +1,25 @@
+import asyncio
+import time
+
+import pytest
+
+
+@pytest.fixture
+def history_store(app_module, tmp_path, monkeypatch):
+    store = app_module.PriceHistoryStore(str(tmp_path / "history.db"), 200, 0.05)
+    store.start()
+    monkeypatch.setattr(app_module, "history_store", store)
+    return store
+
+
+def test_history_limit_is_clamped(app_module, history_store):
+    for price in range(5):
+        result = app_module.empty_result("Amazon", "ok")
+        result.update(price=100 + price, observed_at=time.time())
+        history_store.record("a b", "a b", result)
+    # Closing drains the writer's queue
+    history_store.close()
+
+    assert len(asyncio.run(app_module.price_history("a b", limit=-1))) == 1
+    assert len(asyncio.run(app_module.price_history("a b", limit=0))) == 1
+    assert len(asyncio.run(app_module.price_history("a b", limit=3))) == 3
@@ -0,0 +1,57 @@
+import asyncio
+import time
+
+import pytest
+
+
+@pytest.fixture
+def scheduler(app_module, monkeypatch):
+    refreshed = []
+
+    async def fake_refresh(key, platform, product_name, top_n):
+        refreshed.append((key, platform))
+
+    monkeypatch.setattr(app_module, "refresh_result", fake_refresh)
+    monkeypatch.setattr(app_module, "CACHE_ENABLED", True)
+    app_module.result_cache.clear()
+    scheduler = app_module.RefreshScheduler()
+    scheduler.refreshed = refreshed
+    return scheduler
+
+
+def schedule(scheduler):
+    async def tick():
+        scheduler._schedule_refreshes()
+        await asyncio.sleep(0)
+    asyncio.run(tick())
+
+
+def test_freshly_cached_query_is_not_scraped_again(app_module, scheduler):
+    scheduler.register("a b", source="popular")
+    now = time.time()
+    for platform in app_module.PLATFORMS:
+        result = app_module.empty_result(platform, "ok")
+        result["observed_at"] = now
+        app_module.result_cache.set(("a b", platform, app_module.DEFAULT_TOP_N), result, 300)
+
+    schedule(scheduler)
+    assert scheduler.refreshed == []
+    entry = scheduler.entries["a b"]
+    assert all(due > now for due in entry.next_due.values())
+
+
+def test_uncached_query_is_warmed_right_away(app_module, scheduler):
+    scheduler.register("c d", source="popular")
+    schedule(scheduler)
+    assert sorted(platform for _, platform in scheduler.refreshed) == sorted(app_module.PLATFORMS)
+
+
+def test_cached_failure_is_refreshed(app_module, scheduler):
+    scheduler.register("e f", source="popular")
+    for platform in app_module.PLATFORMS:
+        result = app_module.empty_result(platform, "timeout")
+        result["observed_at"] = time.time()
+        app_module.result_cache.set(("e f", platform, app_module.DEFAULT_TOP_N), result, 30)
+
+    schedule(scheduler)
+    assert len(scheduler.refreshed) == len(app_module.PLATFORMS)
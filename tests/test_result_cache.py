@@ -0,0 +1,27 @@
+import pytest
+
+
+@pytest.fixture
+def cache(app_module):
+    return app_module.ResultCache(10, 600)
+
+
+def age(cache, key, seconds):
+    result, stored_at, ttl = cache._entries[key]
+    cache._entries[key] = (result, stored_at - seconds, ttl)
+
+
+def test_expired_ok_result_is_served_stale(app_module, cache):
+    cache.set("k", app_module.empty_result("Amazon", "ok"), 30)
+    age(cache, "k", 60)
+    result, fresh = cache.get("k")
+    assert result["status"] == "ok"
+    assert not fresh
+
+
+@pytest.mark.parametrize("status", ["timeout", "error", "parse_error", "empty"])
+def test_expired_failure_is_a_miss(app_module, cache, status):
+    cache.set("k", app_module.empty_result("Amazon", status), 30)
+    assert cache.get("k")[1]
+    age(cache, "k", 60)
+    assert cache.get("k") is None
@@ -0,0 +1,53 @@
+import pytest
+
+
+@pytest.fixture
+def worker_deadlines(app_module, monkeypatch):
+    # What init_scrape_worker sets up in a worker process
+    deadlines = {platform: app_module.AdaptiveDeadline(10.0) for platform in app_module.PLATFORMS}
+    for deadline in deadlines.values():
+        deadline.collect()
+    monkeypatch.setattr(app_module, "scrape_deadlines", deadlines)
+    return deadlines
+
+
+def test_job_ships_deadline_samples_once(app_module, worker_deadlines):
+    def scraper(product_name, top_n):
+        worker_deadlines["Amazon"].observe(1.5)
+        return app_module.empty_result("Amazon", "ok")
+
+    result, timings, telemetry = app_module.run_scrape_job(scraper, "a b", 5)
+    assert result["status"] == "ok"
+    assert telemetry["deadline_samples"]["Amazon"] == [1.5]
+    assert telemetry["deadline_samples"]["Meesho"] == []
+
+    _, _, telemetry = app_module.run_scrape_job(lambda product_name, top_n: result, "a b", 5)
+    assert telemetry["deadline_samples"]["Amazon"] == []
+
+
+def test_merged_samples_drive_the_deadline(app_module, monkeypatch):
+    monkeypatch.setattr(app_module, "ADAPTIVE_MIN_SAMPLES", 5)
+    deadline = app_module.AdaptiveDeadline(10.0)
+    assert deadline.take() == []
+    deadline.merge([2.0] * 5)
+    assert deadline.current() == pytest.approx(2.0 * app_module.ADAPTIVE_DEADLINE_FACTOR)
+
+
+def test_job_ships_selector_lookups_to_the_api_registry(app_module, worker_deadlines, monkeypatch, tmp_path):
+    worker_registry = app_module.SelectorRegistry(str(tmp_path / "worker.json"), 0)
+    worker_registry.collect()
+    monkeypatch.setattr(app_module, "selector_registry", worker_registry)
+
+    def scraper(product_name, top_n):
+        worker_registry.record("Meesho", "title", [('p[class*="ProductTitle"]', True, None)])
+        return app_module.empty_result("Meesho", "ok")
+
+    _, _, telemetry = app_module.run_scrape_job(scraper, "a b", 5)
+    # The worker never writes the shared stats file itself
+    assert not (tmp_path / "worker.json").exists()
+    assert worker_registry.take() == []
+
+    api_registry = app_module.SelectorRegistry("", 3600)
+    api_registry.merge(telemetry["selector_lookups"])
+    titles = {entry["selector"]: entry for entry in api_registry.stats()["Meesho"]["title"]}
+    assert titles['p[class*="ProductTitle"]']["hits"] == 1
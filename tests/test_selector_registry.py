@@ -0,0 +1,40 @@
+import pytest
+
+
+@pytest.fixture
+def registry(app_module):
+    return app_module.SelectorRegistry("", 3600)
+
+
+def page(hit_index, selectors):
+    """Lookups for one card that tried selectors in order and hit the one at hit_index."""
+    return [(selector, i == hit_index, None) for i, selector in enumerate(selectors[:hit_index + 1])]
+
+
+def test_catch_all_stays_after_specific_selectors(registry):
+    # One Meesho card without the title class: only the bare 'p' matched
+    order = registry.ordered("Meesho", "title")
+    registry.record("Meesho", "title", page(order.index("p"), order))
+
+    order = registry.ordered("Meesho", "title")
+    assert order[-1] == "p"
+    assert order[0] != "p"
+
+
+def test_specific_selectors_reorder_by_hit_rate(registry):
+    for _ in range(10):
+        order = registry.ordered("Meesho", "title")
+        registry.record("Meesho", "title", page(order.index('p[class*="ProductTitle"]'), order))
+
+    assert registry.ordered("Meesho", "title") == [
+        'p[class*="ProductTitle"]', "p.ProductCard__ProductTitle", "p",
+    ]
+
+
+def test_catch_alls_rank_among_themselves(registry, monkeypatch, app_module):
+    monkeypatch.setitem(app_module.PLATFORMS["Amazon"], "catch_all", ["span.a-offscreen", "span.a-price"])
+    for _ in range(10):
+        order = registry.ordered("Amazon", "price")
+        registry.record("Amazon", "price", page(order.index("span.a-price"), order))
+
+    assert registry.ordered("Amazon", "price") == ["span.a-price-whole", "span.a-price", "span.a-offscreen"]